@@ -12,11 +12,110 @@ class GlobalConfig(BaseConfig):
     DATABASE_URL: Optional[str] = None
     DB_FORCE_ROLL_BACK: bool = False
 
+    # Connection pool (per worker)
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 3
+    DB_POOL_ACQUIRE_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 300
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Optional read replica for read-only user queries
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_STICKY_SECONDS: float = 5.0
+    REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Logging: hand records to a background thread instead of doing I/O on the event loop
+    LOG_QUEUE_ENABLED: bool = False
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_RICH_CONSOLE: bool = True
+
+    # Prometheus-style /metrics endpoint and request instrumentation
+    METRICS_ENABLED: bool = True
+
+    # Queries slower than this are logged with the request's correlation ID (0 disables)
+    SLOW_QUERY_MS: float = 200.0
+
+    # Login throttling (sliding window); 0 disables a limit
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 10
+    LOGIN_RATE_LIMIT_PER_IP: int = 50
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    # "package.module:factory" returning a shared backend for multi-worker setups
+    LOGIN_RATE_LIMIT_BACKEND: Optional[str] = None
+
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Authenticated-principal cache used by get_current_user
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_SIZE: int = 1024
+
+    # JWT signing: one key from SECRET_KEY/ALGORITHM (a PEM private key for RS*/ES*), or a
+    # JSON keys file with several kid-tagged keys for rotation (see app/utils/signing_keys.py)
+    SECRET_KEY: Optional[str] = None
+    ALGORITHM: str = "HS256"
+    JWT_KEYS_FILE: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
+
+    # Stateless JWT authorization (role checks answered from token claims)
+    JWT_STATELESS_AUTH: bool = False
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 30.0
+
+    # Payment evidence uploads
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    # Room for the other form fields and multipart framing on top of UPLOAD_MAX_BYTES
+    UPLOAD_FORM_OVERHEAD_BYTES: int = 64 * 1024
+    UPLOAD_CACHE_MAX_AGE_SECONDS: int = 3600
+    # When set (e.g. "/protected-uploads"), evidence downloads are handed to nginx via
+    # X-Accel-Redirect so it sends the file with sendfile(2)
+    UPLOAD_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+
+    # Payment proof images: re-encoded with a size/quality cap plus a thumbnail (needs Pillow)
+    IMAGE_PROCESSING_ENABLED: bool = True
+    IMAGE_PROCESSING_EXECUTOR: str = "thread"  # or "process"
+    IMAGE_PROCESSING_MAX_WORKERS: int = 2
+    IMAGE_OUTPUT_FORMAT: str = "WEBP"
+    IMAGE_MAX_DIMENSION: int = 2000
+    IMAGE_QUALITY: int = 80
+    IMAGE_THUMBNAIL_SIZE: int = 320
+
+    # Bulk registration
+    BULK_REGISTER_MAX_ROWS: int = 1000
+
+    # `python -m app serve`
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None  # defaults to the CPU count
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None  # per worker; excess connections get 503
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = True
+    # Total DB connections across all workers; splits into DB_POOL_MAX_SIZE per worker
+    DB_MAX_CONNECTIONS: Optional[int] = None
+
+    # Background jobs (post-registration work); the backgroundJobs table is the durable outbox.
+    # With JOB_QUEUE_ENABLED off this process only enqueues; some other process must run them.
+    JOB_QUEUE_ENABLED: bool = True
+    JOB_QUEUE_CONCURRENCY: int = 4
+    JOB_QUEUE_POLL_SECONDS: float = 5.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_LEASE_SECONDS: float = 300.0
+
+    # Warn at startup when migrations are pending (one query against schemaMigrations)
+    DB_CHECK_MIGRATIONS_ON_STARTUP: bool = False
+
 class DevConfig(GlobalConfig):
     model_config = SettingsConfigDict(env_prefix="DEV_", extra="ignore")
 
 
 class ProdConfig(GlobalConfig):
+    LOG_QUEUE_ENABLED: bool = True
+    LOG_RICH_CONSOLE: bool = False
     model_config = SettingsConfigDict(env_prefix="PROD_", extra="ignore")
 
 
@@ -27,13 +126,15 @@ class TestConfig(GlobalConfig):
 
 
 @lru_cache()
-def get_config(env_state: str):
+def get_config(env_state: Optional[str]):
     configs = {"dev": DevConfig, "prod": ProdConfig, "test": TestConfig}
+    if env_state not in configs:
+        # Guessing an environment could point prod at dev settings (or the reverse)
+        raise RuntimeError(f"ENV_STATE must be one of {', '.join(configs)}; got {env_state!r}")
     return configs[env_state]()
 
 
 base_config = BaseConfig()
 
 config = get_config(base_config.ENV_STATE)
-print(f"Current ENV_STATE: {base_config.ENV_STATE}")
 
@@ -52,6 +52,13 @@ users = sa.Table(
     sa.Column("registrationStatus", sa.Boolean, default=False),
     sa.Column("isActive", sa.Boolean, default=True),
     sa.Column("createdAt", sa.DateTime),
+    # Row version behind the ETag of user resources; set on every update
+    sa.Column("updatedAt", sa.DateTime),
+    # Login lookup filters on email and isActive together (unique, since email is)
+    sa.Index("ix_users_email_isActive", "email", "isActive", unique=True),
+    # Admin listings filter on these and paginate on userId
+    sa.Index("ix_users_registrationStatus_userId", "registrationStatus", "userId"),
+    sa.Index("ix_users_departmentId_userId", "departmentId", "userId"),
 )
 
 userPayments = sa.Table(
@@ -59,7 +66,38 @@ userPayments = sa.Table(
     sa.Column("userPaymentId", sa.Integer, primary_key=True),
     sa.Column("userId", sa.Integer),
     sa.Column("paymentEvidence", sa.String(255)),
+    # Small preview of paymentEvidence, generated after upload
+    sa.Column("paymentEvidenceThumbnail", sa.String(255)),
     sa.Column("transactionId", sa.String(100)),
     sa.Column("isActive", sa.Boolean, default=True),
     sa.Column("createdAt", sa.DateTime),
+    sa.Index("ix_userPayments_userId", "userId"),
+)
+
+revokedTokens = sa.Table(
+    "revokedTokens", metadata,
+    sa.Column("revokedTokenId", sa.Integer, primary_key=True),
+    sa.Column("jti", sa.String(64)),
+    sa.Column("userId", sa.Integer),
+    sa.Column("revokedAt", sa.DateTime),
+    sa.Column("expiresAt", sa.DateTime),
+    sa.Index("ix_revokedTokens_expiresAt", "expiresAt"),
+)
+
+# Durable outbox for background jobs; rows are written in the same transaction as the
+# work that produces them and removed once the job succeeds
+backgroundJobs = sa.Table(
+    "backgroundJobs", metadata,
+    sa.Column("jobId", sa.Integer, primary_key=True),
+    sa.Column("kind", sa.String(64)),
+    sa.Column("payload", sa.Text),
+    sa.Column("status", sa.String(16)),
+    sa.Column("attempts", sa.Integer, default=0),
+    sa.Column("runAfter", sa.DateTime),
+    # Set while a worker holds the job; an expired lease makes it claimable again
+    sa.Column("claimToken", sa.String(32)),
+    sa.Column("lockedUntil", sa.DateTime),
+    sa.Column("lastError", sa.Text),
+    sa.Column("createdAt", sa.DateTime),
+    sa.Index("ix_backgroundJobs_status_runAfter", "status", "runAfter"),
 )
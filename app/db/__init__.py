@@ -1,2 +1,2 @@
-from app.db.Users import  users,userPayments as user_model
+from app.db.Users import  users,userPayments as user_model, revokedTokens, backgroundJobs
 from app.db.metadata import metadata
\ No newline at end of file
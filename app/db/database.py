@@ -1,19 +1,92 @@
 from app.db.metadata import metadata  # ✅ Correct — your SQLAlchemy metadata
-import databases
-import sqlalchemy
-from app.config import config
+from app.config import base_config, config
+from app.db.pool import PooledDatabase, pool_options
+from app.db.routing import ReadRouter
 
+# Schema changes are applied with `python -m app.db.migrate upgrade`, not at import.
+# Nothing below opens a connection; the app connects in the lifespan hook.
 
 
-# connect_args = {"check_same_thread": False} if "sqlite" in config.DATABASE_URL else{}
-engine = sqlalchemy.create_engine(
-    config.DATABASE_URL, connect_args={}
-)
+class LazyDatabase:
+    """Stands in for a PooledDatabase and builds it on first use.
+
+    Constructing a databases.Database imports its driver (asyncpg for PostgreSQL), so the
+    pools are built when first touched rather than when this module is imported.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._database = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._database is not None
+
+    def get(self) -> PooledDatabase:
+        if self._database is None:
+            self._database = self._factory()
+        return self._database
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
 
-metadata.create_all(engine)
+def _build_database() -> PooledDatabase:
+    if not config.DATABASE_URL:
+        raise RuntimeError(
+            f"DATABASE_URL is not configured for ENV_STATE={base_config.ENV_STATE} "
+            "(set it with the environment's prefix, e.g. DEV_DATABASE_URL)"
+        )
+    return PooledDatabase(
+        config.DATABASE_URL,
+        force_rollback=config.DB_FORCE_ROLL_BACK,
+        acquire_timeout=config.DB_POOL_ACQUIRE_TIMEOUT,
+        **pool_options(
+            config.DATABASE_URL,
+            min_size=config.DB_POOL_MIN_SIZE,
+            max_size=config.DB_POOL_MAX_SIZE,
+            recycle_seconds=config.DB_POOL_RECYCLE_SECONDS,
+            statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
+        )
+    )
 
-db_args = {"min_size": 1, "max_size": 3} if "postgres" in config.DATABASE_URL else{}
-database = databases.Database(
-    config.DATABASE_URL, force_rollback=config.DB_FORCE_ROLL_BACK, **db_args
+
+def _build_replica_database() -> PooledDatabase:
+    return PooledDatabase(
+        config.DATABASE_REPLICA_URL,
+        acquire_timeout=config.DB_POOL_ACQUIRE_TIMEOUT,
+        **pool_options(
+            config.DATABASE_REPLICA_URL,
+            min_size=config.DB_POOL_MIN_SIZE,
+            max_size=config.DB_POOL_MAX_SIZE,
+            recycle_seconds=config.DB_POOL_RECYCLE_SECONDS,
+            statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
+        )
+    )
+
+
+database = LazyDatabase(_build_database)
+replica_database = LazyDatabase(_build_replica_database) if config.DATABASE_REPLICA_URL else None
+
+read_router = ReadRouter(
+    database,
+    replica_database,
+    sticky_seconds=config.REPLICA_STICKY_SECONDS,
+    retry_seconds=config.REPLICA_RETRY_SECONDS,
 )
 
+
+def supports_returning() -> bool:
+    """Whether the primary's dialect supports INSERT/UPDATE ... RETURNING (MySQL does not)."""
+    return database.url.dialect in ("postgresql", "sqlite")
+
+
+def is_unique_violation(exc: Exception) -> bool:
+    """True if a driver error (asyncpg, aiomysql, sqlite3) is a unique-constraint violation."""
+    name = type(exc).__name__
+    if name == "UniqueViolationError":
+        return True
+    if name == "IntegrityError":
+        message = str(exc).lower()
+        return "unique" in message or "duplicate" in message
+    return False
@@ -0,0 +1,104 @@
+# db/migrate
+#
+# Usage:
+#   python -m app.db.migrate upgrade     apply pending migrations
+#   python -m app.db.migrate current     list applied migrations
+
+import argparse
+import datetime
+import importlib
+import logging
+import pkgutil
+import sys
+from typing import Optional
+
+import sqlalchemy as sa
+
+from app.config import config
+from app.db import migrations
+
+logger = logging.getLogger(__name__)
+
+migration_metadata = sa.MetaData()
+
+schema_migrations = sa.Table(
+    "schemaMigrations", migration_metadata,
+    sa.Column("version", sa.String(64), primary_key=True),
+    sa.Column("appliedAt", sa.DateTime),
+)
+
+
+def available_migrations() -> list[str]:
+    return sorted(
+        module.name for module in pkgutil.iter_modules(migrations.__path__)
+        if module.name.startswith("v")
+    )
+
+
+def applied_migrations(connection: sa.Connection) -> set[str]:
+    schema_migrations.create(connection, checkfirst=True)
+    return {row.version for row in connection.execute(sa.select(schema_migrations.c.version))}
+
+
+def upgrade(database_url: Optional[str] = None) -> list[str]:
+    """Apply every pending migration, each in its own transaction; returns the versions applied."""
+    engine = sa.create_engine(database_url or config.DATABASE_URL)
+    applied = []
+    try:
+        with engine.begin() as connection:
+            done = applied_migrations(connection)
+
+        for version in available_migrations():
+            if version in done:
+                continue
+            module = importlib.import_module(f"{migrations.__name__}.{version}")
+            with engine.begin() as connection:
+                module.upgrade(connection)
+                connection.execute(
+                    schema_migrations.insert().values(version=version, appliedAt=datetime.datetime.utcnow())
+                )
+            logger.info(f"Applied migration {version}")
+            applied.append(version)
+    finally:
+        engine.dispose()
+    return applied
+
+
+def current(database_url: Optional[str] = None) -> list[str]:
+    engine = sa.create_engine(database_url or config.DATABASE_URL)
+    try:
+        with engine.begin() as connection:
+            return sorted(applied_migrations(connection))
+    finally:
+        engine.dispose()
+
+
+async def pending_migrations(database) -> list[str]:
+    """Versions not yet applied, read through the app's async `database` (used at startup)."""
+    try:
+        rows = await database.fetch_all(sa.select(schema_migrations.c.version))
+    except Exception:
+        # No schemaMigrations table yet
+        return available_migrations()
+    done = {row["version"] for row in rows}
+    return [version for version in available_migrations() if version not in done]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrate", description="Apply database migrations")
+    parser.add_argument("command", choices=["upgrade", "current"])
+    parser.add_argument("--database-url", default=None, help="Defaults to the configured DATABASE_URL")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "upgrade":
+        applied = upgrade(args.database_url)
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none pending'}")
+    else:
+        for version in current(args.database_url):
+            print(version)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# db/migrations
+#
+# Each vNNNN_<name>.py module defines `upgrade(connection)`. Applied versions are
+# recorded in the schemaMigrations table; run them with `python -m app.db.migrate`.
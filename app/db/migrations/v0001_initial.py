@@ -0,0 +1,49 @@
+# Baseline schema: the tables the app has always used
+#
+# Tables are frozen here as they were at this version; later changes to app.db.Users
+# must not alter what this migration creates.
+
+import sqlalchemy as sa
+
+metadata = sa.MetaData()
+
+users = sa.Table(
+    "users", metadata,
+    sa.Column("userId", sa.Integer, primary_key=True),
+    sa.Column("firstName", sa.String(100)),
+    sa.Column("lastName", sa.String(100)),
+    sa.Column("email", sa.String(150), unique=True),
+    sa.Column("password", sa.String(255)),
+    sa.Column("phoneNumber", sa.String(20)),
+    sa.Column("departmentId", sa.Integer),
+    sa.Column("roleId", sa.Integer),
+    sa.Column("subscriptionTypeId", sa.Integer),
+    sa.Column("registrationStatus", sa.Boolean),
+    sa.Column("isActive", sa.Boolean),
+    sa.Column("createdAt", sa.DateTime),
+)
+
+userPayments = sa.Table(
+    "userPayments", metadata,
+    sa.Column("userPaymentId", sa.Integer, primary_key=True),
+    sa.Column("userId", sa.Integer),
+    sa.Column("paymentEvidence", sa.String(255)),
+    sa.Column("transactionId", sa.String(100)),
+    sa.Column("isActive", sa.Boolean),
+    sa.Column("createdAt", sa.DateTime),
+)
+
+revokedTokens = sa.Table(
+    "revokedTokens", metadata,
+    sa.Column("revokedTokenId", sa.Integer, primary_key=True),
+    sa.Column("jti", sa.String(64)),
+    sa.Column("userId", sa.Integer),
+    sa.Column("revokedAt", sa.DateTime),
+    sa.Column("expiresAt", sa.DateTime),
+)
+
+
+def upgrade(connection: sa.Connection) -> None:
+    for table in (users, userPayments, revokedTokens):
+        # Existing deployments already have these tables; only create what is missing
+        table.create(connection, checkfirst=True)
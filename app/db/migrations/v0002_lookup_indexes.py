@@ -0,0 +1,30 @@
+# Indexes for the login lookup, admin listings and payment joins
+
+import sqlalchemy as sa
+
+metadata = sa.MetaData()
+
+# Only the indexed columns; the tables themselves come from v0001
+users = sa.Table(
+    "users", metadata,
+    sa.Column("userId", sa.Integer),
+    sa.Column("email", sa.String(150)),
+    sa.Column("departmentId", sa.Integer),
+    sa.Column("registrationStatus", sa.Boolean),
+    sa.Column("isActive", sa.Boolean),
+)
+userPayments = sa.Table("userPayments", metadata, sa.Column("userId", sa.Integer))
+revokedTokens = sa.Table("revokedTokens", metadata, sa.Column("expiresAt", sa.DateTime))
+
+INDEXES = (
+    sa.Index("ix_users_email_isActive", users.c.email, users.c.isActive),
+    sa.Index("ix_users_registrationStatus_userId", users.c.registrationStatus, users.c.userId),
+    sa.Index("ix_users_departmentId_userId", users.c.departmentId, users.c.userId),
+    sa.Index("ix_userPayments_userId", userPayments.c.userId),
+    sa.Index("ix_revokedTokens_expiresAt", revokedTokens.c.expiresAt),
+)
+
+
+def upgrade(connection: sa.Connection) -> None:
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,16 @@
+# users.updatedAt: row version behind the ETag of user resources
+
+import sqlalchemy as sa
+
+users = sa.table("users", sa.column("createdAt", sa.DateTime), sa.column("updatedAt", sa.DateTime))
+
+
+def upgrade(connection: sa.Connection) -> None:
+    columns = {column["name"] for column in sa.inspect(connection).get_columns("users")}
+    if "updatedAt" not in columns:
+        preparer = connection.dialect.identifier_preparer
+        column_type = sa.DateTime().compile(dialect=connection.dialect)
+        connection.execute(sa.text(
+            f"ALTER TABLE {preparer.quote('users')} ADD COLUMN {preparer.quote('updatedAt')} {column_type}"
+        ))
+    connection.execute(users.update().where(users.c.updatedAt.is_(None)).values(updatedAt=users.c.createdAt))
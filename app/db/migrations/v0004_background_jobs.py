@@ -0,0 +1,24 @@
+# backgroundJobs: durable outbox for the in-process job queue
+
+import sqlalchemy as sa
+
+metadata = sa.MetaData()
+
+backgroundJobs = sa.Table(
+    "backgroundJobs", metadata,
+    sa.Column("jobId", sa.Integer, primary_key=True),
+    sa.Column("kind", sa.String(64)),
+    sa.Column("payload", sa.Text),
+    sa.Column("status", sa.String(16)),
+    sa.Column("attempts", sa.Integer),
+    sa.Column("runAfter", sa.DateTime),
+    sa.Column("claimToken", sa.String(32)),
+    sa.Column("lockedUntil", sa.DateTime),
+    sa.Column("lastError", sa.Text),
+    sa.Column("createdAt", sa.DateTime),
+    sa.Index("ix_backgroundJobs_status_runAfter", "status", "runAfter"),
+)
+
+
+def upgrade(connection: sa.Connection) -> None:
+    backgroundJobs.create(connection, checkfirst=True)
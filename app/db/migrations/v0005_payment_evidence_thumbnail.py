@@ -0,0 +1,14 @@
+# userPayments.paymentEvidenceThumbnail: preview image generated for each payment proof
+
+import sqlalchemy as sa
+
+
+def upgrade(connection: sa.Connection) -> None:
+    columns = {column["name"] for column in sa.inspect(connection).get_columns("userPayments")}
+    if "paymentEvidenceThumbnail" not in columns:
+        preparer = connection.dialect.identifier_preparer
+        column_type = sa.String(255).compile(dialect=connection.dialect)
+        connection.execute(sa.text(
+            f"ALTER TABLE {preparer.quote('userPayments')} "
+            f"ADD COLUMN {preparer.quote('paymentEvidenceThumbnail')} {column_type}"
+        ))
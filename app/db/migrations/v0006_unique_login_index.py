@@ -0,0 +1,26 @@
+# ix_users_email_isActive becomes UNIQUE
+#
+# email is already unique, so (email, isActive) is too; declaring it lets the planner pick
+# this index for the login lookup instead of the plain unique index on email, which
+# leaves isActive to be checked against the table row.
+
+import sqlalchemy as sa
+
+metadata = sa.MetaData()
+
+users = sa.Table(
+    "users", metadata,
+    sa.Column("email", sa.String(150)),
+    sa.Column("isActive", sa.Boolean),
+)
+login_index = sa.Index("ix_users_email_isActive", users.c.email, users.c.isActive, unique=True)
+
+
+def upgrade(connection: sa.Connection) -> None:
+    existing = {index["name"]: index for index in sa.inspect(connection).get_indexes("users")}
+    current = existing.get(login_index.name)
+    if current is not None and current["unique"]:
+        return
+    if current is not None:
+        login_index.drop(connection)
+    login_index.create(connection)
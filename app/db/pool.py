@@ -0,0 +1,147 @@
+# db/pool
+
+import asyncio
+import logging
+import time
+
+import databases
+from sqlalchemy.sql import ClauseElement, Delete, Insert, Select, Update
+
+from app.db.tracing import record_query
+from app.utils.metrics import db_query_duration
+
+logger = logging.getLogger(__name__)
+
+
+def pool_options(database_url: str, min_size: int, max_size: int, recycle_seconds: int, statement_timeout_ms: int) -> dict:
+    """Backend-specific pool keyword arguments for databases.Database."""
+    dialect = databases.DatabaseURL(database_url).dialect
+    if dialect == "postgresql":
+        options = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "max_inactive_connection_lifetime": recycle_seconds,
+        }
+        if statement_timeout_ms:
+            options["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        return options
+    if dialect == "mysql":
+        options = {"min_size": min_size, "max_size": max_size, "pool_recycle": recycle_seconds}
+        if statement_timeout_ms:
+            options["init_command"] = f"SET SESSION max_execution_time={int(statement_timeout_ms)}"
+        return options
+    # SQLite has no pool
+    return {}
+
+
+def query_name(query) -> str:
+    """Low-cardinality label for a query, e.g. "select users" or "update users"."""
+    if isinstance(query, (Insert, Update, Delete)):
+        return f"{type(query).__name__.lower()} {query.table.name}"
+    if isinstance(query, Select):
+        tables = query.get_final_froms()
+        return "select " + ",".join(getattr(table, "name", "subquery") for table in tables)
+    if isinstance(query, ClauseElement):
+        return "text"
+    return str(query).split(None, 1)[0].lower() if query else "unknown"
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.acquire_count = 0
+        self.acquire_timeouts = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.acquire_count += 1
+        self.wait_total_seconds += seconds
+        self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+
+
+class PooledDatabase(databases.Database):
+    """databases.Database that bounds and times connection acquisition and reports pool usage."""
+
+    def __init__(self, url: str, *, acquire_timeout: float = 10.0, **options):
+        super().__init__(url, **options)
+        self.min_size = options.get("min_size")
+        self.max_size = options.get("max_size")
+        self.acquire_timeout = acquire_timeout
+        self.pool_metrics = PoolMetrics()
+
+        backend_connection = self._backend.connection
+
+        def connection_factory():
+            raw_connection = backend_connection()
+            acquire = raw_connection.acquire
+
+            async def timed_acquire() -> None:
+                start = time.perf_counter()
+                try:
+                    await asyncio.wait_for(acquire(), timeout=self.acquire_timeout)
+                except asyncio.TimeoutError:
+                    self.pool_metrics.acquire_timeouts += 1
+                    logger.error(f"Timed out after {self.acquire_timeout}s waiting for a DB connection")
+                    raise
+                self.pool_metrics.record_wait(time.perf_counter() - start)
+
+            raw_connection.acquire = timed_acquire
+            return raw_connection
+
+        self._backend.connection = connection_factory
+
+    async def _timed(self, query, operation):
+        start = time.perf_counter()
+        try:
+            return await operation
+        finally:
+            elapsed = time.perf_counter() - start
+            name = query_name(query)
+            db_query_duration.observe(elapsed, query=name)
+            record_query(name, elapsed, query)
+
+    async def fetch_all(self, query, values=None):
+        return await self._timed(query, super().fetch_all(query, values))
+
+    async def fetch_one(self, query, values=None):
+        return await self._timed(query, super().fetch_one(query, values))
+
+    async def fetch_val(self, query, values=None, column=0):
+        return await self._timed(query, super().fetch_val(query, values, column))
+
+    async def execute(self, query, values=None):
+        return await self._timed(query, super().execute(query, values))
+
+    async def execute_many(self, query, values):
+        return await self._timed(query, super().execute_many(query, values))
+
+    def pool_stats(self) -> dict:
+        pool = getattr(self._backend, "_pool", None)
+        size = idle = None
+        if pool is not None:
+            if hasattr(pool, "get_size"):  # asyncpg
+                size, idle = pool.get_size(), pool.get_idle_size()
+            elif hasattr(pool, "freesize"):  # aiomysql / asyncmy
+                size, idle = pool.size, pool.freesize
+        metrics = self.pool_metrics
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle if size is not None else None,
+            "acquire_count": metrics.acquire_count,
+            "acquire_timeouts": metrics.acquire_timeouts,
+            "acquire_wait_total_seconds": round(metrics.wait_total_seconds, 6),
+            "acquire_wait_max_seconds": round(metrics.wait_max_seconds, 6),
+        }
+
+    async def warm_up(self, connections: int) -> None:
+        """Open `connections` pool connections up front so the first requests don't pay for them."""
+
+        async def ping() -> None:
+            async with self.connection() as connection:
+                await connection.execute("SELECT 1")
+
+        await asyncio.gather(*(asyncio.create_task(ping()) for _ in range(connections)))
+        logger.info(f"Database pool warmed up with {connections} connection(s)")
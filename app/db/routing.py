@@ -0,0 +1,118 @@
+# db/routing
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Hashable, Optional
+
+import databases
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the replica is unreachable, as opposed to a bad query. Driver errors are
+# matched by class name so importing this module never loads a driver (asyncpg names).
+REPLICA_ERRORS = (OSError, ConnectionError, asyncio.TimeoutError)
+REPLICA_DRIVER_ERRORS = {"InterfaceError", "PostgresConnectionError"}
+
+
+def is_replica_unavailable(exc: Exception) -> bool:
+    if isinstance(exc, REPLICA_ERRORS):
+        return True
+    # asyncpg's connection errors subclass these (e.g. ConnectionDoesNotExistError)
+    return any(cls.__name__ in REPLICA_DRIVER_ERRORS for cls in type(exc).__mro__)
+
+_force_primary: contextvars.ContextVar[bool] = contextvars.ContextVar("force_primary_reads", default=False)
+
+
+class ReadRouter:
+    """Sends read-only queries to the replica when one is configured and healthy.
+
+    Keys recently written through `mark_write` (an email, a user ID, ...) are read from the
+    primary for `sticky_seconds` so callers see their own writes despite replica lag.
+
+    Stickiness is tracked in memory, per process: with several workers a write handled by
+    one worker does not pin reads served by another. Wrap requests that must read their own
+    writes in `primary_reads()`, or keep REPLICA_STICKY_SECONDS above the replica lag only
+    as a best effort. At most `max_tracked_keys` keys are remembered; the oldest go first.
+    """
+
+    def __init__(
+        self,
+        primary: databases.Database,
+        replica: Optional[databases.Database] = None,
+        sticky_seconds: float = 5.0,
+        retry_seconds: float = 30.0,
+        max_tracked_keys: int = 10_000,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_tracked_keys = max_tracked_keys
+        # Ordered by expiry: every key gets the same sticky window, so re-marked keys move to the end
+        self._recent_writes: OrderedDict[Hashable, float] = OrderedDict()
+        self._replica_down_until = 0.0
+
+    def mark_write(self, *keys: Hashable) -> None:
+        if self.replica is None:
+            return
+        now = time.monotonic()
+        expires_at = now + self.sticky_seconds
+        for key in keys:
+            self._recent_writes[key] = expires_at
+            self._recent_writes.move_to_end(key)
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        recent = self._recent_writes
+        while recent and next(iter(recent.values())) <= now:
+            recent.popitem(last=False)
+        while len(recent) > self.max_tracked_keys:
+            recent.popitem(last=False)
+
+    def mark_replica_down(self) -> None:
+        self._replica_down_until = time.monotonic() + self.retry_seconds
+
+    @contextmanager
+    def primary_reads(self):
+        """Route every read in this context (e.g. the rest of a request) to the primary."""
+        token = _force_primary.set(True)
+        try:
+            yield
+        finally:
+            _force_primary.reset(token)
+
+    def _use_replica(self, key: Optional[Hashable]) -> bool:
+        if self.replica is None or not self.replica.is_connected or _force_primary.get():
+            return False
+        now = time.monotonic()
+        if now < self._replica_down_until:
+            return False
+        if key is not None and key in self._recent_writes:
+            if now < self._recent_writes[key]:
+                return False
+            del self._recent_writes[key]
+        return True
+
+    def database_for(self, key: Optional[Hashable] = None) -> databases.Database:
+        return self.replica if self._use_replica(key) else self.primary
+
+    async def _read(self, method: str, query, key: Optional[Hashable]):
+        if self._use_replica(key):
+            try:
+                return await getattr(self.replica, method)(query)
+            except Exception as exc:
+                if not is_replica_unavailable(exc):
+                    raise
+                logger.warning(f"Replica read failed, falling back to primary: {exc}")
+                self.mark_replica_down()
+        return await getattr(self.primary, method)(query)
+
+    async def fetch_one(self, query, key: Optional[Hashable] = None):
+        return await self._read("fetch_one", query, key)
+
+    async def fetch_all(self, query, key: Optional[Hashable] = None):
+        return await self._read("fetch_all", query, key)
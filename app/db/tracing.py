@@ -0,0 +1,73 @@
+# db/tracing
+
+import contextvars
+import logging
+import time
+from typing import Optional
+
+from app.config import config
+
+logger = logging.getLogger("app.db.slow_query")
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+
+current_query_stats: contextvars.ContextVar[Optional[RequestQueryStats]] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def record_query(name: str, seconds: float, query) -> None:
+    """Add a query to the current request's totals and log it if it was slow."""
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += seconds
+
+    if config.SLOW_QUERY_MS and seconds * 1000 >= config.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query",
+            extra={"query": name, "duration_ms": round(seconds * 1000, 2), "sql": str(query)[:1000]},
+        )
+
+
+class QueryTracingMiddleware:
+    """ASGI middleware that totals DB time per request and reports it in a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                db_ms = stats.total_seconds * 1000
+                server_timing = (
+                    f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", server_timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            logging.getLogger("app.db.tracing").debug(
+                "Request DB usage",
+                extra={"path": scope["path"], "queries": stats.count, "db_ms": round(stats.total_seconds * 1000, 2)},
+            )
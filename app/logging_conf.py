@@ -1,8 +1,18 @@
 import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 from app.config import DevConfig, config
 logger = logging.getLogger("app.register")  # Use your app's logger name
 
+# Loggers whose handlers move behind the queue when LOG_QUEUE_ENABLED is set. Every logger
+# that writes to the shared handlers must be listed: the handlers lose their filters to the
+# queue handler, so a logger still writing to them directly would skip those filters.
+QUEUED_LOGGERS = ("app", "uvicorn", "databases", "aiosqlite")
+
+_queue_listener: Optional[QueueListener] = None
+
 def obfuscated(email: str, obfuscated_length: int) -> str:
     characters = email[:obfuscated_length]
     first, last = email.split("@")
@@ -20,7 +30,63 @@ class EmailObfuscationFilter(logging.Filter):
         return True
 
 
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped and counted when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _start_queue_listener(queue_size: int) -> None:
+    global _queue_listener
+    handlers = []
+    filters = []
+    for name in QUEUED_LOGGERS:
+        for handler in logging.getLogger(name).handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+                # Filters read request context vars, so they must run on the calling thread
+                filters.extend(f for f in handler.filters if f not in filters)
+
+    for handler in handlers:
+        for log_filter in filters:
+            handler.removeFilter(log_filter)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    for log_filter in filters:
+        queue_handler.addFilter(log_filter)
+    for name in QUEUED_LOGGERS:
+        logging.getLogger(name).handlers = [queue_handler]
+
+    _queue_listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def stop_logging() -> None:
+    """Flush and stop the background log listener, if one is running."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def logging_stats() -> dict:
+    handlers = logging.getLogger(QUEUED_LOGGERS[0]).handlers
+    queue_handler = next((h for h in handlers if isinstance(h, DroppingQueueHandler)), None)
+    if queue_handler is None:
+        return {"queued": False}
+    return {"queued": True, "depth": queue_handler.queue.qsize(), "dropped": queue_handler.dropped}
+
+
 def configure_logging() -> None:
+    stop_logging()
     dictConfig(
         {
             "version": 1,
@@ -52,7 +118,7 @@ def configure_logging() -> None:
             },
             "handlers": {
                 "default": {
-                    "class": "rich.logging.RichHandler",
+                    "class": "rich.logging.RichHandler" if config.LOG_RICH_CONSOLE else "logging.StreamHandler",
                     "level": "DEBUG",
                     "formatter": "console",
                     "filters": ["correlation_id", "email_obfuscation"]
@@ -79,4 +145,7 @@ def configure_logging() -> None:
                 "aiosqlite": {"handlers": ["default"], "level": "WARNING"},
             }
         }
-    )
\ No newline at end of file
+    )
+
+    if config.LOG_QUEUE_ENABLED:
+        _start_queue_listener(config.LOG_QUEUE_SIZE)
@@ -1,12 +1,24 @@
 import logging
 from contextlib import asynccontextmanager
+from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, HTTPException
-from app.db.database import database
-from app.logging_conf import configure_logging
+from fastapi.responses import ORJSONResponse
+from app.config import base_config, config
+from app.db.database import database, read_router, replica_database
+from app.db.migrate import pending_migrations
+from app.db.tracing import QueryTracingMiddleware
+from app.logging_conf import configure_logging, stop_logging
+from app.utils.image_processing import image_processor
+from app.utils.job_queue import job_queue
+from app.utils.metrics import MetricsMiddleware
+from app.utils.password_hasher import password_hasher
+from app.utils.token_revocation import revocation_list
+from app.utils.upload_utils import UploadSizeLimitMiddleware
 from fastapi.exception_handlers import http_exception_handler
 
 from app.routers import userlogin
 from app.routers.admin import admin_router
+from app.routers.ops import ops_router
 from app.routers.register import  register_router
 from app.routers.user_routes import user_router
 from app.routers.userlogin import user_login_router
@@ -16,16 +28,52 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
+    logger.info(f"Starting with ENV_STATE={base_config.ENV_STATE}")
     await database.connect()
+    if config.DB_CHECK_MIGRATIONS_ON_STARTUP:
+        pending = await pending_migrations(database)
+        if pending:
+            logger.warning(f"Pending migrations: {', '.join(pending)}; run `python -m app.db.migrate upgrade`")
+    if config.DB_POOL_MIN_SIZE and database.min_size:
+        await database.warm_up(config.DB_POOL_MIN_SIZE)
+    if replica_database is not None:
+        try:
+            await replica_database.connect()
+        except Exception:
+            logger.exception("Read replica unavailable; reads will use the primary")
+            read_router.mark_replica_down()
+    revocation_list.start(config.TOKEN_REVOCATION_REFRESH_SECONDS)
+    if config.JOB_QUEUE_ENABLED:
+        job_queue.start()
+    else:
+        logger.warning(
+            "JOB_QUEUE_ENABLED is off: background jobs are queued but not run by this process; "
+            "another process must run the job workers"
+        )
     yield
+    await job_queue.stop()
+    await revocation_list.stop()
+    if replica_database is not None and replica_database.is_connected:
+        await replica_database.disconnect()
     await database.disconnect()
+    password_hasher.shutdown()
+    image_processor.shutdown()
+    stop_logging()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryTracingMiddleware)
+app.add_middleware(UploadSizeLimitMiddleware)
+# Outermost, so the correlation ID is set for everything that logs below it
+app.add_middleware(CorrelationIdMiddleware)
 
 app.include_router(register_router, prefix="/api/register")
 app.include_router(user_login_router, prefix="/api/user", tags=["User Login"])
 # app.include_router(admin_router, tags=["Admin"])  # ❌ Don't add a prefix here
 app.include_router(user_router)
+app.include_router(ops_router, tags=["Ops"])
 
 @app.exception_handler(HTTPException)
 async def http_exception_handle_logging(request, exc):
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends
 
 from app.routers.user_routes import user_router
-from app.schema.user_schema import RegistrationStatusUpdate
+from app.schema.user_schema import BulkRegistrationStatusUpdate, RegistrationStatusUpdate
 from app.security import get_current_admin_user
-from app.services.admin_service import get_all_users_service, update_user_registration_status
+from app.services.admin_service import (
+    bulk_update_registration_status,
+    get_all_users_service,
+    update_user_registration_status,
+)
 
 admin_router = APIRouter()
 
@@ -19,3 +23,12 @@ async def approve_user_registration(
     current_user=Depends(get_current_admin_user)
 ):
     return await update_user_registration_status(user_id, data.status)
+
+
+@user_router.put("/users/registration-status", summary="Bulk approve/reject user registrations (Admin only)")
+async def bulk_approve_user_registrations(
+    data: BulkRegistrationStatusUpdate,
+    current_user=Depends(get_current_admin_user)
+):
+    filters = data.filter.model_dump() if data.filter else None
+    return await bulk_update_registration_status(data.status, user_ids=data.userIds, filters=filters)
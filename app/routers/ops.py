@@ -0,0 +1,50 @@
+# routers/ops
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import PlainTextResponse
+
+from app.db.database import database
+from app.logging_conf import logging_stats
+from app.security import get_current_admin_user
+from app.utils.job_queue import job_queue
+from app.utils.metrics import GaugeSet, registry
+from app.utils.password_hasher import password_hasher
+from app.utils.signing_keys import get_key_ring
+from app.utils.user_cache import user_cache
+
+ops_router = APIRouter()
+
+# Looked up per scrape so registering this does not build the database pool
+registry.register(GaugeSet(
+    "db_pool", "Database connection pool state", lambda: database.pool_stats(),
+    counters=("acquire_count", "acquire_timeouts", "acquire_wait_total_seconds"),
+))
+registry.register(GaugeSet(
+    "password_hasher", "Password hasher pool state", password_hasher.stats,
+    counters=("hash_count", "verify_count", "rejected_count", "total_seconds"),
+))
+registry.register(GaugeSet(
+    "user_cache", "Authenticated-principal cache state", user_cache.stats, counters=("hits", "misses"),
+))
+registry.register(GaugeSet("log_queue", "Background logging queue state", logging_stats, counters=("dropped",)))
+registry.register(GaugeSet(
+    "background_jobs", "Background job queue depth and workers", job_queue.stats,
+    counters=("processed", "retried", "failed"),
+))
+
+
+@ops_router.get("/ops/db-pool", summary="Database pool usage (Admin only)")
+async def get_db_pool_stats(current_user=Depends(get_current_admin_user)):
+    return database.pool_stats()
+
+
+@ops_router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@ops_router.get("/.well-known/jwks.json", summary="Public keys for verifying access tokens")
+async def get_jwks(response: Response):
+    # Lets other services verify ES*/RS* tokens locally; HMAC secrets are never listed
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_ring().public_jwks()
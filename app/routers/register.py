@@ -1,9 +1,13 @@
+import csv
+import io
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Body, Depends, UploadFile, File, Form, HTTPException, status
 from fastapi.responses import JSONResponse
+from app.config import config
+from app.security import get_current_admin_user
 from app.services import register_service
-from app.schema.user_schema import UserRegisterResponse
+from app.schema.user_schema import BulkRegisterResponse, UserRegisterResponse
 import logging
 
 logger = logging.getLogger("app.register")
@@ -56,3 +60,46 @@ async def register_with_payment(
                 "message": "Internal server error during registration"
             }
         )
+
+
+def _check_bulk_size(rows: list) -> None:
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No rows to register")
+    if len(rows) > config.BULK_REGISTER_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {config.BULK_REGISTER_MAX_ROWS} rows can be registered per request"
+        )
+
+
+@register_router.post("/bulk", response_model=BulkRegisterResponse, summary="Bulk register users (Admin only)")
+async def bulk_register(
+    rows: list[dict] = Body(...),
+    current_user=Depends(get_current_admin_user),
+):
+    _check_bulk_size(rows)
+    logger.info("Bulk register API called with %d rows", len(rows))
+    return await register_service.bulk_register_users(rows)
+
+
+@register_router.post("/bulk/csv", response_model=BulkRegisterResponse, summary="Bulk register users from CSV (Admin only)")
+async def bulk_register_csv(
+    file: UploadFile = File(...),
+    current_user=Depends(get_current_admin_user),
+):
+    content = await file.read(config.UPLOAD_MAX_BYTES + 1)
+    if len(content) > config.UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"CSV file exceeds {config.UPLOAD_MAX_BYTES} bytes"
+        )
+    try:
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        # Empty cells become missing fields so optional columns validate as None
+        rows = [{key: value for key, value in row.items() if value not in (None, "")} for row in reader]
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CSV file")
+
+    _check_bulk_size(rows)
+    logger.info("Bulk register CSV API called with %d rows", len(rows))
+    return await register_service.bulk_register_users(rows)
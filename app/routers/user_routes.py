@@ -1,27 +1,133 @@
 # routers/user_routes
 
-from fastapi import APIRouter, Depends, HTTPException
+import mimetypes
+import os
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from app.config import config
+from app.utils.conditional import (
+    cache_headers,
+    file_etag,
+    is_not_modified,
+    list_etag,
+    not_modified_response,
+    user_etag,
+)
+from app.utils.responses import user_list_response
 from app.utils.user_utils import fetch_all_users, fetch_user_by_id
 from app.security import get_current_admin_user, get_current_regular_user
+from app.services.admin_service import export_users_stream, get_payment_evidence_file
 
 user_router = APIRouter()
 
 # Admin: Get all users
 @user_router.get("/users", summary="Get all users (Admin only)")
-async def get_all_users(current_user=Depends(get_current_admin_user)):
-    return await fetch_all_users()
+async def get_all_users(
+    request: Request,
+    cursor: Optional[int] = Query(None, description="Return users with userId greater than this"),
+    limit: int = Query(100, ge=1, le=1000),
+    registrationStatus: Optional[bool] = None,
+    isActive: Optional[bool] = None,
+    departmentId: Optional[int] = None,
+    roleId: Optional[int] = None,
+    subscriptionTypeId: Optional[int] = None,
+    current_user=Depends(get_current_admin_user),
+):
+    filters = {
+        "registrationStatus": registrationStatus,
+        "isActive": isActive,
+        "departmentId": departmentId,
+        "roleId": roleId,
+        "subscriptionTypeId": subscriptionTypeId,
+    }
+    # Fetch one extra row to know whether another page exists
+    rows = await fetch_all_users(after_id=cursor, limit=limit + 1, filters=filters)
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1]["userId"])
+
+    headers.update(cache_headers(list_etag(rows, cursor, limit, filters)))
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    # Validate and encode the page in one pass instead of jsonable_encoder per row
+    return user_list_response(rows, headers)
+
+# Admin: Stream all users as NDJSON or CSV
+@user_router.get("/users/export", summary="Export users (Admin only)")
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    registrationStatus: Optional[bool] = None,
+    isActive: Optional[bool] = None,
+    departmentId: Optional[int] = None,
+    current_user=Depends(get_current_admin_user),
+):
+    filters = {
+        "registrationStatus": registrationStatus,
+        "isActive": isActive,
+        "departmentId": departmentId,
+    }
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_users_stream(format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+# Admin: Download a user's payment proof (or its thumbnail)
+@user_router.get("/users/{user_id}/payment-evidence", summary="Download payment evidence (Admin only)")
+async def get_payment_evidence(
+    user_id: int,
+    request: Request,
+    thumbnail: bool = False,
+    current_user=Depends(get_current_admin_user),
+):
+    path, stat_result = await get_payment_evidence_file(user_id, thumbnail)
+    filename = os.path.basename(path)
+    etag = file_etag(stat_result)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={config.UPLOAD_CACHE_MAX_AGE_SECONDS}"}
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+
+    if config.UPLOAD_ACCEL_REDIRECT_PREFIX:
+        # nginx serves the bytes (sendfile, ranges); we only authorize and locate the file
+        headers["X-Accel-Redirect"] = f"{config.UPLOAD_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(filename)}"
+        return Response(headers=headers, media_type=mimetypes.guess_type(filename)[0])
+    # Handles Range/If-Range itself and uses the server's pathsend extension when available
+    return FileResponse(
+        path, headers=headers, stat_result=stat_result, filename=filename, content_disposition_type="inline"
+    )
 
 # User: Get your own profile
 @user_router.get("/users/me", summary="Get current user profile")
-async def get_my_profile(current_user=Depends(get_current_regular_user)):
-    return current_user
+async def get_my_profile(request: Request, response: Response, current_user=Depends(get_current_regular_user)):
+    if config.JWT_STATELESS_AUTH and isinstance(current_user, dict):
+        # Claims-only principal; load the full profile row
+        current_user = await fetch_user_by_id(current_user["userId"])
+    return _conditional_user(request, response, current_user)
 
 # User: Get specific user by ID (only your own ID)
 @user_router.get("/users/{user_id}", summary="Get user by ID (User only)")
-async def get_user_by_id_route(user_id: int, current_user=Depends(get_current_regular_user)):
+async def get_user_by_id_route(
+    user_id: int, request: Request, response: Response, current_user=Depends(get_current_regular_user)
+):
     if current_user["userId"] != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
-    return await fetch_user_by_id(user_id)
+    return _conditional_user(request, response, await fetch_user_by_id(user_id))
+
+
+def _conditional_user(request: Request, response: Response, user):
+    """Return 304 when the client's ETag still matches, else the row with ETag headers set."""
+    if user is None:
+        return user
+    headers = cache_headers(user_etag(user))
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return user
 
 
 # @user_router.put("/users/{user_id}/approve", summary="Approve user registration (Admin only)")
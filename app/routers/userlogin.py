@@ -1,14 +1,19 @@
+import datetime
 import logging
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from app.schema.user_schema import UserLoginResponse, LoginRequest
+from app.security import get_token_payload
 from app.services.userlogin_service import user_login_details
+from app.utils.rate_limiter import login_throttle
+from app.utils.token_revocation import revocation_list
 
 logger = logging.getLogger(__name__)
 
 user_login_router = APIRouter()
 
 @user_login_router.post("/login", response_model=UserLoginResponse, status_code=status.HTTP_200_OK)
-async def login_user(login: LoginRequest):
+async def login_user(login: LoginRequest, request: Request):
+    await login_throttle.check(login.user_email, request.client.host if request.client else None)
     try:
         return await user_login_details(login)
     except HTTPException as e:
@@ -18,3 +23,16 @@ async def login_user(login: LoginRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unexpected error during login"
         )
+
+
+@user_login_router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout_user(payload: dict = Depends(get_token_payload)):
+    jti = payload.get("jti")
+    if jti is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked"
+        )
+    expires_at = datetime.datetime.utcfromtimestamp(payload["exp"])
+    await revocation_list.revoke_token(jti, payload.get("userId"), expires_at)
+    return {"status_code": 200, "message": "Logout successful"}
@@ -1,6 +1,6 @@
 # schema/user_schema
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, model_validator
 from typing import Optional
 from datetime import datetime  # ✅ Correct
 
@@ -15,6 +15,26 @@ class UserRegisterInput(BaseModel):
     subscriptionTypeId: int
 
 
+class BulkUserRegisterInput(UserRegisterInput):
+    transactionId: Optional[str] = None
+
+
+class BulkRegisterRowResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: str
+    userId: Optional[int] = None
+    errors: Optional[list[str]] = None
+
+
+class BulkRegisterResponse(BaseModel):
+    statusCode: int
+    message: str
+    created: int
+    failed: int
+    results: list[BulkRegisterRowResult]
+
+
 class PaymentInfo(BaseModel):
     transactionId: Optional[str]= None
     paymentEvidence: Optional[str]= None
@@ -50,13 +70,47 @@ class UserOut(BaseModel):
     userId: int
     firstName: str
     lastName: str
-    email: EmailStr
-    phoneNumber: str
+    # Plain str: stored emails were validated at registration, and running the email
+    # validator on every output row dominated list serialization time
+    email: str
+    phoneNumber: Optional[str] = None
+    departmentId: Optional[int] = None
+    roleId: Optional[int] = None
+    subscriptionTypeId: Optional[int] = None
     registrationStatus: bool
     isActive: bool
-    createdAt: datetime
+    createdAt: Optional[datetime] = None
+    updatedAt: Optional[datetime] = None
+
+
+class UserListResponse(BaseModel):
+    status_code: int
+    message: str
+    data: list[UserOut]
 
 
 
 class RegistrationStatusUpdate(BaseModel):
-    status: bool
\ No newline at end of file
+    status: bool
+
+
+class RegistrationStatusFilter(BaseModel):
+    departmentId: Optional[int] = None
+    roleId: Optional[int] = None
+    subscriptionTypeId: Optional[int] = None
+    isActive: Optional[bool] = None
+
+
+class BulkRegistrationStatusUpdate(BaseModel):
+    status: bool
+    userIds: Optional[list[int]] = None
+    filter: Optional[RegistrationStatusFilter] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.userIds is None) == (self.filter is None):
+            raise ValueError("Provide either userIds or filter")
+        # An empty filter would match every user, admins included
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must set at least one field")
+        return self
@@ -1,20 +1,21 @@
 import datetime
 import logging
-import os
+import uuid
+from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
-from jose import jwt, ExpiredSignatureError, JWTError
-from dotenv import load_dotenv
+from jose import ExpiredSignatureError, JWTError
 
 from app.config import config
+from app.utils.password_hasher import password_hasher, pwd_context
+from app.utils.signing_keys import get_key_ring
+from app.utils.token_revocation import revocation_list
+from app.utils.user_cache import user_cache
 from app.utils.user_utils import fetch_user_by_email
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"])
 
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,24 +26,31 @@ credentials_exception = HTTPException(
 def access_token_expire_minutes() -> int:
     return 30
 
-def create_access_token(email: str, role_id: int) -> str:
-    expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=access_token_expire_minutes())
+def create_access_token(email: str, role_id: int, user: Optional[dict] = None) -> str:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    expire = now + datetime.timedelta(minutes=access_token_expire_minutes())
     jwt_data = {
         "sub": email,
         "role_id": role_id,
-        "exp": expire
+        "exp": expire,
+        # Sub-second, so a token issued right after a user-wide revocation is not caught by it
+        "iat": now.timestamp(),
+        "jti": uuid.uuid4().hex,
     }
-    encoded_jwt = jwt.encode(
-        jwt_data,
-        key=os.getenv("DEV_SECRET_KEY"),
-        algorithm=os.getenv("DEV_ALGORITHM")
-    )
+    if config.JWT_STATELESS_AUTH and user is not None:
+        # Claims needed to authorize without loading the user row
+        jwt_data.update({
+            "userId": user["userId"],
+            "registrationStatus": bool(user["registrationStatus"]),
+            "isActive": bool(user["isActive"]),
+        })
+    # Keys are parsed once; the token's kid header names the key that signed it
+    encoded_jwt = get_key_ring().sign(jwt_data)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+def decode_access_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, key=os.getenv("DEV_SECRET_KEY"), algorithms=[os.getenv("DEV_ALGORITHM")])
+        payload = get_key_ring().verify(token)
         email = payload.get("sub")
         role_id = payload.get("role_id")
         if email is None or role_id is None:
@@ -56,12 +64,43 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
 
-    user = await fetch_user_by_email(email=email)
+    if revocation_list.is_revoked(payload.get("jti"), payload.get("userId"), payload.get("iat")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return payload
+
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    return decode_access_token(credentials.credentials)
+
+async def get_current_user(payload: dict = Depends(get_token_payload)):
+    email = payload["sub"]
+    user = user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await fetch_user_by_email(email=email)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(email, user)
     return user
 
-async def get_current_admin_user(current_user=Depends(get_current_user)):
+async def get_current_principal(payload: dict = Depends(get_token_payload)):
+    """Claims-only principal in stateless mode; falls back to the DB row for older tokens."""
+    if not config.JWT_STATELESS_AUTH or "userId" not in payload:
+        return await get_current_user(payload)
+
+    if not payload.get("isActive", False):
+        raise credentials_exception
+    return {
+        "userId": payload["userId"],
+        "email": payload["sub"],
+        "roleId": payload["role_id"],
+        "registrationStatus": payload.get("registrationStatus", False),
+        "isActive": payload["isActive"],
+    }
+
+async def get_current_admin_user(current_user=Depends(get_current_principal)):
     if current_user["roleId"] != 1:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -69,7 +108,7 @@ async def get_current_admin_user(current_user=Depends(get_current_user)):
         )
     return current_user
 
-async def get_current_regular_user(current_user=Depends(get_current_user)):
+async def get_current_regular_user(current_user=Depends(get_current_principal)):
     if current_user["roleId"] != 2:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -82,3 +121,10 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
@@ -0,0 +1,120 @@
+# server
+#
+# Production entry point:
+#   python -m app serve [--workers N] [--host H] [--port P] [--db-max-connections N]
+#
+# Workers are separate processes that import app.main themselves, so per-worker settings
+# (the DB pool size) are handed over through the environment before they start. With one
+# worker uvicorn runs the app in this process, whose config is already loaded, so the same
+# settings are also applied to the live config.
+
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+from typing import Optional
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "app.main:app"
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    return max(workers or os.cpu_count() or 1, 1)
+
+
+def per_worker_pool_size(max_connections: Optional[int], workers: int, default: int) -> int:
+    """Split a total connection budget evenly across workers (at least one connection each)."""
+    if not max_connections:
+        return default
+    size = max_connections // workers
+    if size < 1:
+        logger.warning(
+            f"DB_MAX_CONNECTIONS={max_connections} is below the worker count ({workers}); using 1 per worker"
+        )
+        return 1
+    return size
+
+
+def select_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def select_http() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def pool_environment(pool_size: int) -> dict[str, str]:
+    """Env vars that make each worker's config use `pool_size` connections."""
+    prefix = type(config).model_config.get("env_prefix", "")
+    return {
+        f"{prefix}DB_POOL_MAX_SIZE": str(pool_size),
+        f"{prefix}DB_POOL_MIN_SIZE": str(min(config.DB_POOL_MIN_SIZE, pool_size)),
+    }
+
+
+def apply_pool_size(pool_size: int) -> None:
+    """Size the DB pool for this process and for any worker processes started after this."""
+    min_size = min(config.DB_POOL_MIN_SIZE, pool_size)
+    os.environ.update(pool_environment(pool_size))
+    config.DB_POOL_MAX_SIZE = pool_size
+    config.DB_POOL_MIN_SIZE = min_size
+
+
+def uvicorn_options(host: str, port: int, workers: int) -> dict:
+    return {
+        "host": host,
+        "port": port,
+        "workers": workers,
+        "loop": select_loop(),
+        "http": select_http(),
+        "backlog": config.SERVER_BACKLOG,
+        "timeout_keep_alive": config.SERVER_KEEPALIVE_SECONDS,
+        "limit_concurrency": config.SERVER_LIMIT_CONCURRENCY,
+        # On SIGTERM uvicorn stops accepting connections and waits this long for
+        # in-flight requests before the lifespan shutdown closes the pools
+        "timeout_graceful_shutdown": config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "access_log": config.SERVER_ACCESS_LOG,
+        "lifespan": "on",
+    }
+
+
+def serve(args) -> int:
+    import uvicorn
+
+    workers = resolve_workers(args.workers)
+    pool_size = per_worker_pool_size(args.db_max_connections, workers, config.DB_POOL_MAX_SIZE)
+    apply_pool_size(pool_size)
+
+    options = uvicorn_options(args.host, args.port, workers)
+    print(
+        f"Serving {APP_PATH} on {args.host}:{args.port} with {workers} worker(s), "
+        f"loop={options['loop']}, http={options['http']}, db pool={pool_size} per worker"
+    )
+    uvicorn.run(APP_PATH, **options)
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the API")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Serve the API with uvicorn workers")
+    serve_parser.add_argument("--host", default=config.SERVER_HOST)
+    serve_parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    serve_parser.add_argument("--workers", type=int, default=config.SERVER_WORKERS, help="Defaults to the CPU count")
+    serve_parser.add_argument(
+        "--db-max-connections", type=int, default=config.DB_MAX_CONNECTIONS,
+        help="Total DB connections across workers (defaults to DB_POOL_MAX_SIZE per worker)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,31 @@
 # service/admin_service
 
+import csv
+import io
 import logging
 import json
+import os
+import stat
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
 
-from fastapi import status, Header
+import sqlalchemy as sa
+from fastapi import HTTPException, status, Header
 from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
 
-from app.db import users
-from app.db.database import database
-from app.schema.user_schema import UserOut
-from app.utils.user_utils import fetch_all_users  # Make sure this accepts a token
+from starlette.concurrency import run_in_threadpool
+
+from app.db import user_model as userPayments, users
+from app.config import config
+from app.db.database import database, read_router, supports_returning
+from app.schema.user_schema import UserListResponse
+from app.security import access_token_expire_minutes
+from app.services.register_service import UPLOAD_DIR
+from app.utils.token_revocation import revocation_list
+from app.utils.responses import model_response, validate_users
+from app.utils.upload_utils import resolve_upload_path
+from app.utils.user_cache import user_cache
+from app.utils.user_utils import USER_LIST_COLUMNS, USER_LIST_KEY, build_user_list_query, fetch_all_users, user_filter_clauses
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +37,16 @@ async def get_all_users_service(authorization: str = Header(...)):
 
         token = authorization.split(" ")[1]
 
-        # ✅ Fetch all users (token-based validation inside fetch_all_users)
-        users_list = await fetch_all_users(token)
-
-        # ✅ Convert DB rows to Pydantic models and then to JSON serializable dicts
-        users_data = [UserOut(**dict(user)) for user in users_list]
-        json_ready_data = jsonable_encoder(users_data)
+        # ✅ Fetch all users
+        users_list = await fetch_all_users()
 
-        # ✅ Return structured response
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status_code": 200,
-                "message": "User list fetched successfully",
-                "data": json_ready_data
-            }
+        # ✅ Validate all rows in one pass and encode straight to JSON bytes
+        return model_response(
+            UserListResponse(
+                status_code=200,
+                message="User list fetched successfully",
+                data=validate_users(users_list),
+            )
         )
 
     except ValueError as ve:
@@ -61,6 +71,14 @@ async def get_all_users_service(authorization: str = Header(...)):
         )
 
 
+async def _revoke_stale_claims(user_ids: list[int]) -> None:
+    # Stateless tokens carry registrationStatus as a claim; ones issued before the change
+    # would keep the old status until they expire
+    if config.JWT_STATELESS_AUTH and user_ids:
+        expires_at = datetime.utcnow() + timedelta(minutes=access_token_expire_minutes())
+        await revocation_list.revoke_users(user_ids, expires_at)
+
+
 async def update_user_registration_status(user_id: int, is_approved: bool):
     try:
         query = users.select().where(users.c.userId == user_id)
@@ -91,9 +109,12 @@ async def update_user_registration_status(user_id: int, is_approved: bool):
         update_query = (
             users.update()
             .where(users.c.userId == user_id)
-            .values(registrationStatus=new_status)
+            .values(registrationStatus=new_status, updatedAt=datetime.utcnow())
         )
         await database.execute(update_query)
+        await _revoke_stale_claims([user_id])
+        user_cache.invalidate(email=user["email"])
+        read_router.mark_write(user_id, user["email"], USER_LIST_KEY)
         logger.info(f"User registrationStatus updated to {new_status} for user_id={user_id}")
 
         return JSONResponse(
@@ -114,3 +135,165 @@ async def update_user_registration_status(user_id: int, is_approved: bool):
                 "error": str(e)
             }
         )
+
+
+BULK_STATUS_BATCH_SIZE = 1000
+
+
+async def _update_status_batch(user_ids: list[int], new_status: bool) -> tuple[list[int], list[int], list[int]]:
+    """Apply the status to one batch; returns (updated, unchanged, missing) user IDs."""
+    condition = (users.c.userId.in_(user_ids)) & (users.c.registrationStatus != new_status)
+    update_query = users.update().where(condition).values(
+        registrationStatus=new_status, updatedAt=datetime.utcnow()
+    )
+
+    async with database.transaction():
+        if supports_returning():
+            # Common case (all pending) is answered by the UPDATE alone
+            updated = {row["userId"] for row in await database.fetch_all(update_query.returning(users.c.userId))}
+            remaining = [user_id for user_id in user_ids if user_id not in updated]
+            existing = set()
+            if remaining:
+                query = sa.select(users.c.userId).where(users.c.userId.in_(remaining))
+                existing = {row["userId"] for row in await database.fetch_all(query)}
+        else:
+            query = sa.select(users.c.userId, users.c.registrationStatus).where(users.c.userId.in_(user_ids))
+            rows = await database.fetch_all(query)
+            existing = {row["userId"] for row in rows if bool(row["registrationStatus"]) == new_status}
+            updated = {row["userId"] for row in rows} - existing
+            if updated:
+                await database.execute(update_query)
+
+    unchanged = [user_id for user_id in user_ids if user_id in existing]
+    missing = [user_id for user_id in user_ids if user_id not in updated and user_id not in existing]
+    return sorted(updated), unchanged, missing
+
+
+async def _update_status_by_filter(filters: dict, new_status: bool) -> list[int]:
+    clauses = user_filter_clauses(filters)
+    if not clauses:
+        raise ValueError("Refusing to update registration status without a filter")
+    condition = sa.and_(users.c.registrationStatus != new_status, *clauses)
+    update_query = users.update().where(condition).values(
+        registrationStatus=new_status, updatedAt=datetime.utcnow()
+    )
+
+    async with database.transaction():
+        if supports_returning():
+            rows = await database.fetch_all(update_query.returning(users.c.userId))
+            return sorted(row["userId"] for row in rows)
+
+        rows = await database.fetch_all(sa.select(users.c.userId).where(condition))
+        user_ids = sorted(row["userId"] for row in rows)
+        if user_ids:
+            await database.execute(
+                users.update()
+                .where(users.c.userId.in_(user_ids))
+                .values(registrationStatus=new_status, updatedAt=datetime.utcnow())
+            )
+        return user_ids
+
+
+async def bulk_update_registration_status(
+    is_approved: bool, user_ids: Optional[list[int]] = None, filters: Optional[dict] = None
+):
+    try:
+        updated, unchanged, missing = [], [], []
+        if user_ids is not None:
+            unique_ids = list(dict.fromkeys(user_ids))
+            for start in range(0, len(unique_ids), BULK_STATUS_BATCH_SIZE):
+                batch = await _update_status_batch(unique_ids[start:start + BULK_STATUS_BATCH_SIZE], is_approved)
+                updated.extend(batch[0])
+                unchanged.extend(batch[1])
+                missing.extend(batch[2])
+        else:
+            updated = await _update_status_by_filter(filters or {}, is_approved)
+
+        await _revoke_stale_claims(updated)
+        for user_id in updated:
+            user_cache.invalidate(user_id=user_id)
+        read_router.mark_write(USER_LIST_KEY, *updated)
+        logger.info(
+            f"Bulk registrationStatus={is_approved}: {len(updated)} updated, "
+            f"{len(unchanged)} unchanged, {len(missing)} missing"
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "status_code": 200,
+                "message": f"{len(updated)} user registrations {'approved' if is_approved else 'disapproved'}",
+                "updated": updated,
+                "unchanged": unchanged,
+                "missing": missing,
+            }
+        )
+
+    except Exception as e:
+        logger.exception("Error occurred while bulk updating user registration status")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "status_code": 500,
+                "message": "Internal Server Error",
+                "error": str(e)
+            }
+        )
+
+EXPORT_BATCH_SIZE = 500
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def export_users_stream(export_format: str, filters: Optional[dict] = None) -> AsyncIterator[str]:
+    """Stream users from a server-side cursor as NDJSON or CSV, batching rows into chunks."""
+    columns = [column.name for column in USER_LIST_COLUMNS]
+    query = build_user_list_query(filters)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    row_count = 0
+    async for row in read_router.database_for(USER_LIST_KEY).iterate(query):
+        values = [_export_value(row[name]) for name in columns]
+        if writer is not None:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values))))
+            buffer.write("\n")
+
+        row_count += 1
+        if row_count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+    logger.info("User export finished", extra={"format": export_format, "rows": row_count})
+
+
+async def get_payment_evidence_file(user_id: int, thumbnail: bool = False) -> tuple[str, os.stat_result]:
+    """Path and stat of the user's latest payment proof (or its thumbnail); 404 if there is none."""
+    column = userPayments.c.paymentEvidenceThumbnail if thumbnail else userPayments.c.paymentEvidence
+    filename = await database.fetch_val(
+        sa.select(column)
+        .where(userPayments.c.userId == user_id)
+        .order_by(userPayments.c.userPaymentId.desc())
+        .limit(1)
+    )
+    path = resolve_upload_path(UPLOAD_DIR, filename) if filename else None
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment evidence not found")
+
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        logger.warning("Payment evidence file is missing", extra={"userId": user_id, "file": filename})
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment evidence not found")
+    return path, stat_result
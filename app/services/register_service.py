@@ -92,30 +92,150 @@
 
 
 
+import asyncio
 import os
 from datetime import datetime
-from passlib.hash import bcrypt
-from sqlalchemy import insert, select
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from app.config import config
 from app.db.Users import users, userPayments
-from app.db.database import database
-from fastapi import status
+from app.db.database import database, is_unique_violation, read_router, supports_returning
+from app.schema.user_schema import BulkRegisterResponse, BulkRegisterRowResult, BulkUserRegisterInput
+from app.security import get_password_hash_async
+from app.utils.image_processing import image_processor
+from app.utils.job_queue import job_queue
+from app.utils.password_hasher import password_hasher
+from app.utils.user_utils import USER_LIST_KEY
+from app.utils.upload_utils import discard_upload, finalize_upload, safe_filename, stream_upload_to_temp
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 import logging
 
 logger = logging.getLogger("app.register")
 
 UPLOAD_DIR = "uploads/payment_proofs"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+REGISTRATION_PAYMENT_JOB = "registration_payment"
+PAYMENT_IMAGE_JOB = "payment_image"
+
+
+@job_queue.handler(REGISTRATION_PAYMENT_JOB)
+async def process_registration_payment(payload: dict) -> None:
+    """Move the payment proof into place and write the userPayments row; safe to re-run."""
+    user_id = payload["userId"]
+    filename = payload["filename"]
+    if payload["tempPath"]:
+        if os.path.exists(payload["tempPath"]):
+            await finalize_upload(payload["tempPath"], payload["uploadDir"], filename)
+        elif not os.path.exists(os.path.join(payload["uploadDir"], filename)):
+            raise FileNotFoundError(f"Payment proof for user {user_id} is missing")
+
+    existing = await database.fetch_one(
+        select(userPayments.c.userPaymentId).where(userPayments.c.userId == user_id)
+    )
+    if existing is None:
+        async with database.transaction():
+            payment_id = await database.execute(
+                insert(userPayments).values(
+                    userId=user_id,
+                    paymentEvidence=filename,
+                    transactionId=payload["transactionId"],
+                    isActive=True,
+                    createdAt=datetime.fromisoformat(payload["createdAt"])
+                )
+            )
+            if filename and config.IMAGE_PROCESSING_ENABLED and image_processor.available:
+                await job_queue.enqueue(PAYMENT_IMAGE_JOB, {"userPaymentId": payment_id, "uploadDir": payload["uploadDir"]})
+        job_queue.wake()
+    logger.info("Payment record processed", extra={"userId": user_id, "uploadedFileName": filename})
+
+
+@job_queue.handler(PAYMENT_IMAGE_JOB)
+async def process_payment_image(payload: dict) -> None:
+    """Re-encode the proof with a size/quality cap, render a thumbnail and record both names."""
+    payment_id = payload["userPaymentId"]
+    upload_dir = payload["uploadDir"]
+    payment = await database.fetch_one(
+        select(userPayments.c.paymentEvidence, userPayments.c.paymentEvidenceThumbnail)
+        .where(userPayments.c.userPaymentId == payment_id)
+    )
+    if payment is None or not payment["paymentEvidence"] or payment["paymentEvidenceThumbnail"]:
+        return
+
+    original = payment["paymentEvidence"]
+    processed = await image_processor.process(
+        os.path.join(upload_dir, original), upload_dir, os.path.splitext(original)[0]
+    )
+    if processed is None:
+        logger.info("Payment proof kept as uploaded", extra={"userPaymentId": payment_id, "file": original})
+        return
+
+    await database.execute(
+        update(userPayments)
+        .where(userPayments.c.userPaymentId == payment_id)
+        .values(paymentEvidence=processed.filename, paymentEvidenceThumbnail=processed.thumbnail)
+    )
+    # Only drop the upload once the row points at its replacement
+    if processed.filename != original:
+        await discard_upload(os.path.join(upload_dir, original))
+    logger.info("Payment proof processed", extra={
+        "userPaymentId": payment_id, "file": processed.filename, "thumbnail": processed.thumbnail
+    })
+
 
 async def register_user_with_payment_core(user_data: dict, paymentEvidence, transactionId: str = None):
     email = user_data.get("email", "-")
+    temp_path = None
     try:
         logger.info("Starting registration process", extra={"email": email})
 
-        # Check if user already exists
-        query = select(users).where(users.c.email == email)
-        existing = await database.fetch_one(query)
-        if existing:
+        # Stream the payment evidence to a temp file first so bad uploads are rejected before any DB write
+        if paymentEvidence:
+            temp_path, content_type = await stream_upload_to_temp(paymentEvidence, UPLOAD_DIR)
+            logger.debug("Payment proof streamed", extra={"email": email, "contentType": content_type})
+
+        # Hash the password (runs in the hasher pool, off the event loop)
+        hashed_password = await get_password_hash_async(user_data["password"])
+        logger.debug("Password hashed", extra={"email": email})
+
+        # Insert the user and queue the payment work in one transaction; the email unique
+        # constraint rejects duplicates. Moving the proof into place and writing the
+        # userPayments row happen in a background job after the response.
+        now = datetime.utcnow()
+        try:
+            async with database.transaction():
+                query = insert(users).values(
+                    firstName=user_data["firstName"],
+                    lastName=user_data["lastName"],
+                    email=email,
+                    password=hashed_password,
+                    phoneNumber=user_data["phoneNumber"],
+                    departmentId=user_data["departmentId"],
+                    roleId=user_data["roleId"],
+                    subscriptionTypeId=user_data["subscriptionTypeId"],
+                    registrationStatus=False,
+                    isActive=True,
+                    createdAt=now,
+                    updatedAt=now
+                )
+                user_id = await database.execute(query)
+
+                filename = None
+                if temp_path:
+                    filename = f"{user_id}_{safe_filename(paymentEvidence.filename)}"
+
+                await job_queue.enqueue(REGISTRATION_PAYMENT_JOB, {
+                    "userId": user_id,
+                    "tempPath": temp_path,
+                    "uploadDir": UPLOAD_DIR,
+                    "filename": filename,
+                    "transactionId": transactionId,
+                    "createdAt": now.isoformat(),
+                })
+            # Committed: the job owns the temp file from here on
+            temp_path = None
+        except Exception as exc:
+            if not is_unique_violation(exc):
+                raise
             logger.warning("User already exists", extra={"email": email})
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -125,49 +245,11 @@ async def register_user_with_payment_core(user_data: dict, paymentEvidence, tran
                 }
             )
 
-        # Hash the password
-        hashed_password = bcrypt.hash(user_data["password"])
-        logger.debug("Password hashed", extra={"email": email})
-
-        # Insert user
-        query = insert(users).values(
-            firstName=user_data["firstName"],
-            lastName=user_data["lastName"],
-            email=email,
-            password=hashed_password,
-            phoneNumber=user_data["phoneNumber"],
-            departmentId=user_data["departmentId"],
-            roleId=user_data["roleId"],
-            subscriptionTypeId=user_data["subscriptionTypeId"],
-            registrationStatus=False,
-            isActive=True,
-            createdAt=datetime.utcnow()
-        )
-        user_id = await database.execute(query)
-        logger.info("User inserted", extra={"email": email, "userId": user_id})
-
-        # Save payment evidence file (if present)
-        filename = None
-        if paymentEvidence:
-            filename = f"{user_id}_{paymentEvidence.filename}"
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            with open(file_path, "wb") as f:
-                f.write(await paymentEvidence.read())
-            logger.debug("Payment proof uploaded", extra={"userId": user_id, "uploadedFileName": filename})
-        else:
-            logger.info("No payment evidence uploaded", extra={"userId": user_id})
-
-        # Insert payment details (file is optional)
-        await database.execute(
-            insert(userPayments).values(
-                userId=user_id,
-                paymentEvidence=filename,
-                transactionId=transactionId,
-                isActive=True,
-                createdAt=datetime.utcnow()
-            )
-        )
-        logger.info("Payment record inserted", extra={"userId": user_id, "transactionId": transactionId})
+        job_queue.wake()
+        read_router.mark_write(email, user_id, USER_LIST_KEY)
+        logger.info("User inserted, payment processing queued", extra={
+            "email": email, "userId": user_id, "transactionId": transactionId, "uploadedFileName": filename
+        })
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
@@ -178,6 +260,9 @@ async def register_user_with_payment_core(user_data: dict, paymentEvidence, tran
             }
         )
 
+    except HTTPException:
+        raise
+
     except Exception:
         logger.exception("Error during user registration", extra={"email": email})
         return JSONResponse(
@@ -187,3 +272,138 @@ async def register_user_with_payment_core(user_data: dict, paymentEvidence, tran
                 "message": "An unexpected error occurred during registration"
             }
         )
+
+    finally:
+        await discard_upload(temp_path)
+
+
+async def _hash_passwords(passwords: list[str]) -> list[str]:
+    # Hash in slices no wider than the pool so single logins still get queue room
+    hashed = []
+    step = max(password_hasher.max_workers, 1)
+    for start in range(0, len(passwords), step):
+        batch = passwords[start:start + step]
+        hashed.extend(await asyncio.gather(*(get_password_hash_async(p) for p in batch)))
+    return hashed
+
+
+async def _insert_bulk_users(entries: list[tuple[BulkUserRegisterInput, str]]) -> dict[str, int]:
+    """Insert users and their payment rows with one multi-row INSERT each; returns email -> userId."""
+    now = datetime.utcnow()
+    user_values = [
+        {
+            "firstName": user_input.firstName,
+            "lastName": user_input.lastName,
+            "email": user_input.email,
+            "password": hashed_password,
+            "phoneNumber": user_input.phoneNumber,
+            "departmentId": user_input.departmentId,
+            "roleId": user_input.roleId,
+            "subscriptionTypeId": user_input.subscriptionTypeId,
+            "registrationStatus": False,
+            "isActive": True,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for user_input, hashed_password in entries
+    ]
+
+    async with database.transaction():
+        query = insert(users).values(user_values)
+        if supports_returning():
+            rows = await database.fetch_all(query.returning(users.c.userId, users.c.email))
+        else:
+            await database.execute(query)
+            emails = [user_input.email for user_input, _ in entries]
+            rows = await database.fetch_all(select(users.c.userId, users.c.email).where(users.c.email.in_(emails)))
+        user_ids = {record["email"]: record["userId"] for record in rows}
+        await database.execute(
+            insert(userPayments).values([
+                {
+                    "userId": user_ids[user_input.email],
+                    "paymentEvidence": None,
+                    "transactionId": user_input.transactionId,
+                    "isActive": True,
+                    "createdAt": now,
+                }
+                for user_input, _ in entries
+            ])
+        )
+    return user_ids
+
+
+async def bulk_register_users(rows: list[dict]) -> BulkRegisterResponse:
+    results: list[BulkRegisterRowResult] = []
+    valid: list[tuple[int, BulkUserRegisterInput]] = []
+    seen_emails = set()
+
+    # Validate every row and drop in-batch duplicates
+    for index, row in enumerate(rows, start=1):
+        try:
+            user_input = BulkUserRegisterInput(**row)
+        except ValidationError as ve:
+            errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in ve.errors()]
+            results.append(BulkRegisterRowResult(row=index, email=row.get("email"), status="invalid", errors=errors))
+            continue
+
+        if user_input.email in seen_emails:
+            results.append(BulkRegisterRowResult(row=index, email=user_input.email, status="duplicate"))
+            continue
+        seen_emails.add(user_input.email)
+        valid.append((index, user_input))
+
+    # One IN query for emails that are already registered
+    existing = set()
+    if seen_emails:
+        query = select(users.c.email).where(users.c.email.in_(seen_emails))
+        existing = {record["email"] for record in await database.fetch_all(query)}
+
+    to_create = []
+    for index, user_input in valid:
+        if user_input.email in existing:
+            results.append(BulkRegisterRowResult(row=index, email=user_input.email, status="exists"))
+        else:
+            to_create.append((index, user_input))
+
+    user_ids = {}
+    if to_create:
+        hashed_passwords = await _hash_passwords([user_input.password for _, user_input in to_create])
+        pending = [
+            (index, user_input, hashed_password)
+            for (index, user_input), hashed_password in zip(to_create, hashed_passwords)
+        ]
+        while pending:
+            try:
+                user_ids = await _insert_bulk_users([(user_input, hashed) for _, user_input, hashed in pending])
+                break
+            except Exception as exc:
+                if not is_unique_violation(exc):
+                    raise
+                # Another request registered some of these emails since the check above
+                query = select(users.c.email).where(users.c.email.in_([user_input.email for _, user_input, _ in pending]))
+                taken = {record["email"] for record in await database.fetch_all(query)}
+                if not taken:
+                    raise
+                for index, user_input, _ in pending:
+                    if user_input.email in taken:
+                        results.append(BulkRegisterRowResult(row=index, email=user_input.email, status="exists"))
+                pending = [entry for entry in pending if entry[1].email not in taken]
+
+        if user_ids:
+            read_router.mark_write(USER_LIST_KEY, *user_ids.keys(), *user_ids.values())
+        for index, user_input in to_create:
+            if user_input.email in user_ids:
+                results.append(BulkRegisterRowResult(
+                    row=index, email=user_input.email, status="created", userId=user_ids[user_input.email]
+                ))
+
+    results.sort(key=lambda result: result.row)
+    created = len(user_ids)
+    logger.info("Bulk registration finished", extra={"rows": len(rows), "created": created})
+    return BulkRegisterResponse(
+        statusCode=status.HTTP_200_OK,
+        message="Bulk registration processed",
+        created=created,
+        failed=len(rows) - created,
+        results=results,
+    )
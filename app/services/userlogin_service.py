@@ -56,11 +56,11 @@
 
 
 import logging
-from fastapi import status
-from starlette.responses import JSONResponse
+from fastapi import HTTPException, status
 
 from app.schema.user_schema import UserLoginResponse
-from app.security import verify_password, create_access_token
+from app.security import verify_password_async, create_access_token
+from app.utils.responses import model_response
 from app.utils.user_utils import fetch_user_by_email
 
 logger = logging.getLogger(__name__)
@@ -73,56 +73,58 @@ async def user_login_details(login):
 
     if not user_record:
         logger.warning("User not found", extra={"email": login.user_email})
-        return JSONResponse(
-            status_code=status.HTTP_403_FORBIDDEN,
-            content=UserLoginResponse(
+        return model_response(
+            UserLoginResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 message="Invalid credentials"
-            ).model_dump()
+            ),
+            status.HTTP_403_FORBIDDEN,
         )
 
     # Convert to dict
     user = dict(user_record)
 
     try:
-        # Password verification
-        if not verify_password(login.user_password, user["password"]):
+        # Password verification (runs in the hasher pool, off the event loop)
+        if not await verify_password_async(login.user_password, user["password"]):
             logger.warning("Incorrect password", extra={"email": login.user_email})
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content=UserLoginResponse(
+            return model_response(
+                UserLoginResponse(
                     status_code=status.HTTP_403_FORBIDDEN,
                     message="Invalid credentials"
-                ).model_dump()
+                ),
+                status.HTTP_403_FORBIDDEN,
             )
+    except HTTPException:
+        # Hasher pool is saturated; let the 503 propagate
+        raise
     except Exception as e:
         logger.exception("Password verification failed", extra={"email": login.user_email})
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=UserLoginResponse(
+        return model_response(
+            UserLoginResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 message="Password verification failed"
-            ).model_dump()
+            ),
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
     try:
         # ✅ FIXED: pass both email and roleId
-        token = create_access_token(email=login.user_email, role_id=user["roleId"])
+        token = create_access_token(email=login.user_email, role_id=user["roleId"], user=user)
     except Exception as e:
         logger.exception("Token creation failed", extra={"email": login.user_email})
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=UserLoginResponse(
+        return model_response(
+            UserLoginResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 message="Token creation failed"
-            ).model_dump()
+            ),
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
     # Successful login
     logger.info("User login successful", extra={"email": login.user_email})
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=UserLoginResponse(
+    return model_response(
+        UserLoginResponse(
             status_code=status.HTTP_200_OK,
             message="Login successful",
             userId=user["userId"],
@@ -130,5 +132,6 @@ async def user_login_details(login):
             roleId=user["roleId"],
             firstName=user["firstName"],
             email=user["email"],
-        ).model_dump()
+        ),
+        status.HTTP_200_OK,
     )
@@ -8,8 +8,13 @@ from httpx import AsyncClient, Request, Response, ASGITransport
 
 
 
+from app.config import config
+from app.db import migrate
 from app.db.database import database
 from app.main import app
+from app.utils.rate_limiter import InMemorySlidingWindow, login_throttle
+from app.utils.signing_keys import get_key_ring
+from app.utils.user_cache import user_cache
 
 
 @pytest.fixture(scope="session")
@@ -17,6 +22,16 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def migrated_db():
+    migrate.upgrade()
+
+
+@pytest.fixture(autouse=True)
+def reset_login_throttle(monkeypatch):
+    monkeypatch.setattr(login_throttle, "backend", InMemorySlidingWindow())
+
+
 @pytest.fixture()
 def client() -> Generator:
     yield TestClient(app)
@@ -36,3 +51,43 @@ async def async_client(client) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
 
+@pytest.fixture()
+def signing_key(monkeypatch):
+    monkeypatch.setattr(config, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(config, "ALGORITHM", "HS256")
+    get_key_ring.cache_clear()
+    user_cache.clear()
+    yield
+    get_key_ring.cache_clear()
+
+
+@pytest.fixture()
+def register_user(async_client: AsyncClient, signing_key):
+    async def _register(email: str, role_id: int = 2, password: str = "s3cret", **fields) -> str:
+        form = {
+            "firstName": "Test",
+            "lastName": "User",
+            "email": email,
+            "password": password,
+            "phoneNumber": "1234567890",
+            "departmentId": "1",
+            "roleId": str(role_id),
+            "subscriptionTypeId": "1",
+            **fields,
+        }
+        response = await async_client.post("/api/register/", data=form)
+        assert response.status_code == 201
+
+        response = await async_client.post(
+            "/api/user/login", json={"user_email": email, "user_password": password}
+        )
+        assert response.status_code == 200
+        return response.json()["token"]
+
+    return _register
+
+
+@pytest.fixture()
+async def admin_headers(register_user) -> dict:
+    token = await register_user("admin@example.com", role_id=1)
+    return {"Authorization": f"Bearer {token}"}
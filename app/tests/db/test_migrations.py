@@ -0,0 +1,25 @@
+# tests/db/test_migrations.py
+import pytest
+import sqlalchemy as sa
+
+from app.db import migrate
+from app.db.metadata import metadata
+
+
+@pytest.mark.anyio
+async def test_migrations_build_the_current_schema(tmp_path):
+    # Migrations carry their own table definitions; together they must match app.db.Users
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    migrate.upgrade(url)
+
+    engine = sa.create_engine(url)
+    try:
+        inspector = sa.inspect(engine)
+        for table in metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            assert columns == set(table.columns.keys()), table.name
+            indexes = {index["name"]: index["unique"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                assert indexes.get(index.name) == index.unique, index.name
+    finally:
+        engine.dispose()
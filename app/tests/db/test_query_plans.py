@@ -0,0 +1,39 @@
+# tests/db/test_query_plans.py
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db import users
+from app.db.database import database
+from app.utils.user_utils import build_user_list_query
+
+
+DIALECTS = {"sqlite": sqlite.dialect(), "postgresql": postgresql.dialect()}
+
+
+async def query_plan(query) -> str:
+    dialect = database.url.dialect
+    if dialect not in DIALECTS:
+        pytest.skip(f"No query plan check for {dialect}")
+    compiled = query.compile(dialect=DIALECTS[dialect], compile_kwargs={"literal_binds": True})
+    if dialect == "sqlite":
+        rows = await database.fetch_all(sa.text(f"EXPLAIN QUERY PLAN {compiled}"))
+        return "\n".join(str(row["detail"]) for row in rows)
+    # Tiny test tables would otherwise always be sequentially scanned
+    async with database.transaction():
+        await database.execute(sa.text("SET LOCAL enable_seqscan = off"))
+        rows = await database.fetch_all(sa.text(f"EXPLAIN {compiled}"))
+    return "\n".join(str(row[0]) for row in rows)
+
+
+@pytest.mark.anyio
+async def test_login_lookup_uses_index():
+    query = users.select().where((users.c.email == "a@example.com") & (users.c.isActive == True))
+    plan = await query_plan(query)
+    assert "ix_users_email_isActive" in plan
+
+
+@pytest.mark.anyio
+async def test_listing_by_status_uses_index():
+    plan = await query_plan(build_user_list_query({"registrationStatus": False}, after_id=10))
+    assert "ix_users_registrationStatus_userId" in plan
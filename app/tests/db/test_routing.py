@@ -0,0 +1,76 @@
+# tests/db/test_routing.py
+import pytest
+
+from app.db.routing import ReadRouter
+
+
+class InterfaceError(Exception):
+    """Named like asyncpg's, which the router recognises without importing asyncpg."""
+
+
+class ConnectionDoesNotExistError(InterfaceError):
+    pass
+
+
+class StubDatabase:
+    def __init__(self, name: str, fail: bool = False, error: Exception = ConnectionRefusedError("replica down")):
+        self.name = name
+        self.fail = fail
+        self.error = error
+        self.is_connected = True
+
+    async def fetch_one(self, query):
+        if self.fail:
+            raise self.error
+        return self.name
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_replica():
+    router = ReadRouter(StubDatabase("primary"), StubDatabase("replica"))
+    assert await router.fetch_one("SELECT 1") == "replica"
+
+
+@pytest.mark.anyio
+async def test_recent_writes_read_from_primary():
+    router = ReadRouter(StubDatabase("primary"), StubDatabase("replica"), sticky_seconds=60)
+    router.mark_write("a@example.com")
+
+    assert await router.fetch_one("SELECT 1", key="a@example.com") == "primary"
+    assert await router.fetch_one("SELECT 1", key="b@example.com") == "replica"
+    with router.primary_reads():
+        assert await router.fetch_one("SELECT 1", key="b@example.com") == "primary"
+
+
+@pytest.mark.anyio
+async def test_falls_back_to_primary_when_replica_fails():
+    router = ReadRouter(StubDatabase("primary"), StubDatabase("replica", fail=True))
+
+    assert await router.fetch_one("SELECT 1") == "primary"
+    assert router.database_for().name == "primary"
+
+
+@pytest.mark.anyio
+async def test_falls_back_on_driver_connection_errors():
+    replica = StubDatabase("replica", fail=True, error=ConnectionDoesNotExistError("connection was closed"))
+    router = ReadRouter(StubDatabase("primary"), replica)
+    assert await router.fetch_one("SELECT 1") == "primary"
+
+
+@pytest.mark.anyio
+async def test_query_errors_are_not_treated_as_replica_outages():
+    router = ReadRouter(StubDatabase("primary"), StubDatabase("replica", fail=True, error=ValueError("bad query")))
+    with pytest.raises(ValueError):
+        await router.fetch_one("SELECT 1")
+
+
+@pytest.mark.anyio
+async def test_recent_writes_are_pruned_and_capped():
+    router = ReadRouter(StubDatabase("primary"), StubDatabase("replica"), sticky_seconds=0, max_tracked_keys=2)
+    router.mark_write("expired")
+    router.mark_write("a", "b", "c")
+    assert list(router._recent_writes) == []
+
+    router.sticky_seconds = 60
+    router.mark_write("a", "b", "c")
+    assert list(router._recent_writes) == ["b", "c"]
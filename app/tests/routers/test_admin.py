@@ -0,0 +1,122 @@
+# tests/routers/test_admin.py
+import pytest
+import sqlalchemy as sa
+from httpx import AsyncClient
+
+from app.db import user_model as userPayments, users
+from app.db.database import database
+from app.services import admin_service
+
+
+async def user_ids(async_client: AsyncClient, headers: dict, **params) -> list[int]:
+    response = await async_client.get("/users", params=params, headers=headers)
+    return [user["userId"] for user in response.json()]
+
+
+@pytest.mark.anyio
+async def test_bulk_approve_by_ids(async_client: AsyncClient, register_user, admin_headers):
+    for i in range(3):
+        await register_user(f"pending{i}@example.com", departmentId="5")
+    ids = await user_ids(async_client, admin_headers, departmentId=5)
+
+    response = await async_client.put(
+        "/users/registration-status", json={"status": True, "userIds": ids[:2]}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == ids[:2]
+
+    response = await async_client.put(
+        "/users/registration-status", json={"status": True, "userIds": ids + [999999]}, headers=admin_headers
+    )
+    data = response.json()
+    assert data["updated"] == ids[2:]
+    assert data["unchanged"] == ids[:2]
+    assert data["missing"] == [999999]
+
+
+@pytest.mark.anyio
+async def test_bulk_approve_by_filter(async_client: AsyncClient, register_user, admin_headers):
+    for i in range(2):
+        await register_user(f"dept6_{i}@example.com", departmentId="6")
+    ids = await user_ids(async_client, admin_headers, departmentId=6)
+
+    response = await async_client.put(
+        "/users/registration-status", json={"status": True, "filter": {"departmentId": 6}}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == ids
+    assert await user_ids(async_client, admin_headers, departmentId=6, registrationStatus=True) == ids
+
+
+@pytest.mark.anyio
+async def test_bulk_approve_requires_ids_or_filter(async_client: AsyncClient, admin_headers):
+    response = await async_client.put(
+        "/users/registration-status", json={"status": True}, headers=admin_headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("filters", [{}, {"departmentId": None, "roleId": None, "isActive": None}])
+async def test_bulk_approve_rejects_empty_filter(async_client: AsyncClient, register_user, admin_headers, filters):
+    await register_user("unfiltered@example.com")
+    statuses = sa.select(users.c.userId, users.c.registrationStatus).order_by(users.c.userId)
+    before = [tuple(row) for row in await database.fetch_all(statuses)]
+
+    response = await async_client.put(
+        "/users/registration-status", json={"status": True, "filter": filters}, headers=admin_headers
+    )
+    assert response.status_code == 422
+    assert [tuple(row) for row in await database.fetch_all(statuses)] == before
+
+
+@pytest.fixture()
+def evidence(tmp_path, monkeypatch):
+    monkeypatch.setattr(admin_service, "UPLOAD_DIR", str(tmp_path))
+
+    async def _evidence(user_id: int, filename: str, content: bytes = b"") -> None:
+        if content:
+            (tmp_path / filename).write_bytes(content)
+        await database.execute(userPayments.insert().values(userId=user_id, paymentEvidence=filename, isActive=True))
+
+    return _evidence
+
+
+@pytest.mark.anyio
+async def test_payment_evidence_download(async_client: AsyncClient, admin_headers, evidence):
+    await evidence(42, "42_proof.png", b"0123456789")
+    url = "/users/42/payment-evidence"
+
+    response = await async_client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["cache-control"].startswith("private, max-age=")
+    etag = response.headers["etag"]
+
+    response = await async_client.get(url, headers={**admin_headers, "Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+
+    response = await async_client.get(url, headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = await async_client.get(url, params={"thumbnail": True}, headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_payment_evidence_stays_inside_upload_dir(async_client: AsyncClient, admin_headers, evidence):
+    await evidence(43, "../../etc/passwd")
+
+    response = await async_client.get("/users/43/payment-evidence", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_payment_evidence_is_admin_only(async_client: AsyncClient, register_user, evidence):
+    token = await register_user("regular@example.com")
+    await evidence(44, "44_proof.png", b"data")
+
+    response = await async_client.get("/users/44/payment-evidence", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
@@ -0,0 +1,112 @@
+# tests/routers/test_auth.py
+import asyncio
+import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import config
+from app.db.database import database
+from app.utils.rate_limiter import login_throttle
+from app.utils.token_revocation import revocation_list
+
+email = "auth.test@example.com"
+
+
+@pytest.mark.anyio
+async def test_login_wrong_password(async_client: AsyncClient, register_user):
+    await register_user(email)
+    response = await async_client.post(
+        "/api/user/login", json={"user_email": email, "user_password": "wrong"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_get_my_profile(async_client: AsyncClient, register_user):
+    token = await register_user(email)
+    response = await async_client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == email
+
+
+@pytest.mark.anyio
+async def test_stateless_mode_authorizes_from_claims(async_client: AsyncClient, register_user, monkeypatch):
+    monkeypatch.setattr(config, "JWT_STATELESS_AUTH", True)
+    token = await register_user(email)
+
+    response = await async_client.get("/users", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+    response = await async_client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == email
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_token(async_client: AsyncClient, register_user):
+    token = await register_user(email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.post("/api/user/logout", headers=headers)
+    assert response.status_code == 200
+
+    response = await async_client.get("/users/me", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_status_change_revokes_stateless_tokens(async_client: AsyncClient, register_user, admin_headers, monkeypatch):
+    monkeypatch.setattr(config, "JWT_STATELESS_AUTH", True)
+    monkeypatch.setattr(revocation_list, "_users_revoked_at", {})
+    token = await register_user(email)
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = (await async_client.get("/users/me", headers=headers)).json()["userId"]
+
+    # The token still claims registrationStatus=false once the admin approves the user
+    response = await async_client.put(f"/users/{user_id}/approve", json={"status": True}, headers=admin_headers)
+    assert response.status_code == 200
+
+    response = await async_client.get("/users/me", headers=headers)
+    assert response.status_code == 401
+
+    # Logging in again straight away (usually within the same second) gets a working token
+    response = await async_client.post("/api/user/login", json={"user_email": email, "user_password": "s3cret"})
+    token = response.json()["token"]
+    response = await async_client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_revocation_during_refresh_is_kept(monkeypatch):
+    monkeypatch.setattr(revocation_list, "_jtis", set())
+    fetch_all = database.fetch_all
+
+    async def slow_fetch_all(query, values=None):
+        rows = await fetch_all(query, values)
+        await asyncio.sleep(0.05)  # the snapshot is older than the revocation below
+        return rows
+
+    monkeypatch.setattr(database, "fetch_all", slow_fetch_all)
+    refresh = asyncio.create_task(revocation_list.refresh())
+    await asyncio.sleep(0)
+    await revocation_list.revoke_token("in-flight", None, datetime.datetime.utcnow() + datetime.timedelta(minutes=5))
+    await refresh
+
+    assert revocation_list.is_revoked("in-flight", None, None)
+
+
+@pytest.mark.anyio
+async def test_login_is_throttled_per_email(async_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(login_throttle, "per_email", 2)
+    for _ in range(2):
+        response = await async_client.post(
+            "/api/user/login", json={"user_email": email, "user_password": "wrong"}
+        )
+        assert response.status_code == 403
+
+    response = await async_client.post(
+        "/api/user/login", json={"user_email": email, "user_password": "wrong"}
+    )
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
@@ -0,0 +1,57 @@
+# tests/routers/test_ops.py
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.anyio
+async def test_db_pool_stats(async_client: AsyncClient, admin_headers):
+    response = await async_client.get("/ops/db-pool", headers=admin_headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["acquire_timeouts"] == 0
+    assert {"in_use", "idle", "acquire_wait_max_seconds"} <= stats.keys()
+
+
+@pytest.mark.anyio
+async def test_db_pool_stats_requires_admin(async_client: AsyncClient, register_user):
+    token = await register_user("user@example.com")
+    response = await async_client.get("/ops/db-pool", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(async_client: AsyncClient, register_user):
+    await register_user("metrics@example.com")
+
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_requests_total{method="POST",route="/api/user/login",status="200"}' in body
+    assert 'db_query_duration_seconds_count{query="insert users"}' in body
+    assert 'password_hash_duration_seconds_count{operation="hash"}' in body
+    assert "# TYPE user_cache_hits_total counter" in body
+    assert "# TYPE password_hasher_hash_total counter" in body
+    assert "# TYPE background_jobs_processed_total counter" in body
+    assert "# TYPE user_cache_size gauge" in body
+
+
+@pytest.mark.anyio
+async def test_server_timing_and_correlation_id(async_client: AsyncClient, admin_headers):
+    response = await async_client.get("/users", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["x-request-id"]
+    # Principal lookup plus the listing query
+    assert 'db;dur=' in response.headers["server-timing"]
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+    # The principal is now cached
+    response = await async_client.get("/users", headers=admin_headers)
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+
+
+@pytest.mark.anyio
+async def test_jwks_never_lists_hmac_secrets(async_client: AsyncClient, signing_key):
+    response = await async_client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    assert response.headers["cache-control"] == "public, max-age=300"
@@ -0,0 +1,185 @@
+# tests/routers/test_register.py
+import os
+
+import pytest
+import sqlalchemy as sa
+from httpx import AsyncClient
+
+from app.db.Users import userPayments
+from app.db.database import database
+from app.services import register_service
+from app.utils.job_queue import job_queue
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 128
+
+user_form = {
+    "firstName": "Test",
+    "lastName": "User",
+    "email": "register.test@example.com",
+    "password": "s3cret",
+    "phoneNumber": "1234567890",
+    "departmentId": "1",
+    "roleId": "2",
+    "subscriptionTypeId": "1",
+    "transactionId": "TXN-1",
+}
+
+
+@pytest.fixture()
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(register_service, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_register_with_payment_evidence(async_client: AsyncClient, upload_dir):
+    response = await async_client.post(
+        "/api/register/",
+        data=user_form,
+        files={"paymentEvidence": ("../proof.png", PNG_BYTES, "image/png")},
+    )
+    assert response.status_code == 201
+    user_id = response.json()["userId"]
+
+    # The proof is moved into place and the payment recorded by a background job
+    assert await job_queue.run_pending() == 1
+    assert os.listdir(upload_dir) == [f"{user_id}_proof.png"]
+    assert (upload_dir / f"{user_id}_proof.png").read_bytes() == PNG_BYTES
+    payment = await database.fetch_one(userPayments.select().where(userPayments.c.userId == user_id))
+    assert payment["paymentEvidence"] == f"{user_id}_proof.png"
+    assert payment["transactionId"] == "TXN-1"
+
+
+@pytest.mark.anyio
+async def test_payment_proof_is_reencoded_with_thumbnail(async_client: AsyncClient, upload_dir):
+    Image = pytest.importorskip("PIL.Image")
+    proof = upload_dir / "source.png"
+    Image.effect_noise((400, 300), 64).convert("RGB").save(proof)
+
+    response = await async_client.post(
+        "/api/register/", data=user_form, files={"paymentEvidence": ("proof.png", proof.read_bytes(), "image/png")}
+    )
+    proof.unlink()
+    user_id = response.json()["userId"]
+    assert await job_queue.run_pending() == 1  # payment row
+    assert await job_queue.run_pending() == 1  # image processing
+
+    payment = await database.fetch_one(userPayments.select().where(userPayments.c.userId == user_id))
+    assert payment["paymentEvidence"] == f"{user_id}_proof.webp"
+    assert payment["paymentEvidenceThumbnail"] == f"{user_id}_proof_thumb.webp"
+    assert sorted(os.listdir(upload_dir)) == [f"{user_id}_proof.webp", f"{user_id}_proof_thumb.webp"]
+
+
+@pytest.mark.anyio
+async def test_register_rejects_unknown_file_type(async_client: AsyncClient, upload_dir):
+    response = await async_client.post(
+        "/api/register/",
+        data=user_form,
+        files={"paymentEvidence": ("proof.png", b"not an image", "image/png")},
+    )
+    assert response.status_code == 415
+    assert os.listdir(upload_dir) == []
+
+
+@pytest.mark.anyio
+async def test_register_rejects_oversized_file(async_client: AsyncClient, upload_dir, monkeypatch):
+    async def small_limit(upload, dest_dir):
+        return await stream_upload_to_temp(upload, dest_dir, max_bytes=64, chunk_size=16)
+
+    stream_upload_to_temp = register_service.stream_upload_to_temp
+    monkeypatch.setattr(register_service, "stream_upload_to_temp", small_limit)
+
+    response = await async_client.post(
+        "/api/register/",
+        data=user_form,
+        files={"paymentEvidence": ("proof.png", PNG_BYTES, "image/png")},
+    )
+    assert response.status_code == 413
+    assert os.listdir(upload_dir) == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("returning", [True, False])
+async def test_bulk_register_reports_per_row(async_client: AsyncClient, register_user, monkeypatch, returning):
+    # Without RETURNING (MySQL) the new ids are read back by email
+    monkeypatch.setattr(register_service, "supports_returning", lambda: returning)
+    token = await register_user("admin@example.com", role_id=1)
+    rows = [
+        {**user_form, "email": "bulk1@example.com"},
+        {**user_form, "email": "bulk2@example.com", "transactionId": None},
+        {**user_form, "email": "bulk1@example.com"},
+        {**user_form, "email": "admin@example.com"},
+        {**user_form, "email": "not-an-email"},
+    ]
+
+    response = await async_client.post(
+        "/api/register/bulk", json=rows, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    assert [result["status"] for result in data["results"]] == [
+        "created", "created", "duplicate", "exists", "invalid"
+    ]
+    assert all(result["userId"] for result in data["results"][:2])
+
+
+@pytest.mark.anyio
+async def test_bulk_register_concurrent_duplicate_is_exists(async_client: AsyncClient, register_user, monkeypatch):
+    token = await register_user("admin@example.com", role_id=1)
+    hash_passwords = register_service._hash_passwords
+
+    async def register_in_between(passwords):
+        # Another request wins the race for race2@ after the existence check
+        await register_user("race2@example.com")
+        return await hash_passwords(passwords)
+
+    monkeypatch.setattr(register_service, "_hash_passwords", register_in_between)
+    rows = [{**user_form, "email": f"race{i}@example.com"} for i in range(1, 4)]
+
+    response = await async_client.post(
+        "/api/register/bulk", json=rows, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [result["status"] for result in data["results"]] == ["created", "exists", "created"]
+    count = await database.fetch_val(
+        userPayments.select().with_only_columns(sa.func.count()).where(
+            userPayments.c.userId.in_([result["userId"] for result in data["results"] if result["userId"]])
+        )
+    )
+    assert count == 2
+
+
+@pytest.mark.anyio
+async def test_bulk_register_csv(async_client: AsyncClient, register_user):
+    token = await register_user("admin@example.com", role_id=1)
+    header = ",".join(user_form)
+    lines = [header] + [
+        ",".join({**user_form, "email": f"csv{i}@example.com"}.values()) for i in range(3)
+    ]
+
+    response = await async_client.post(
+        "/api/register/bulk/csv",
+        files={"file": ("users.csv", "\n".join(lines).encode(), "text/csv")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+
+@pytest.mark.anyio
+async def test_register_duplicate_email(async_client: AsyncClient, upload_dir):
+    response = await async_client.post("/api/register/", data=user_form)
+    assert response.status_code == 201
+
+    response = await async_client.post(
+        "/api/register/",
+        data=user_form,
+        files={"paymentEvidence": ("proof.png", PNG_BYTES, "image/png")},
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "User already exists with this email"
+    assert os.listdir(upload_dir) == []
@@ -0,0 +1,119 @@
+# tests/routers/test_user_routes.py
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.anyio
+async def test_list_users_is_paginated(async_client: AsyncClient, register_user, admin_headers):
+    for i in range(3):
+        await register_user(f"user{i}@example.com", departmentId="7")
+
+    response = await async_client.get("/users", params={"limit": 2}, headers=admin_headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    assert all("password" not in user for user in first_page)
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await async_client.get("/users", params={"limit": 2, "cursor": cursor}, headers=admin_headers)
+    second_page = response.json()
+    assert len(second_page) == 2
+    assert "X-Next-Cursor" not in response.headers
+    assert second_page[0]["userId"] > first_page[-1]["userId"]
+
+
+@pytest.mark.anyio
+async def test_list_users_filters(async_client: AsyncClient, register_user, admin_headers):
+    await register_user("dept7@example.com", departmentId="7")
+
+    response = await async_client.get("/users", params={"departmentId": 7}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [user] = response.json()
+    assert user["email"] == "dept7@example.com"
+    assert user["departmentId"] == 7
+    assert user["createdAt"] and user["updatedAt"]
+
+
+@pytest.mark.anyio
+async def test_export_users_ndjson(async_client: AsyncClient, register_user, admin_headers):
+    await register_user("export@example.com", departmentId="9")
+
+    response = await async_client.get(
+        "/users/export", params={"departmentId": 9}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert '"email": "export@example.com"' in lines[0]
+    assert "password" not in lines[0]
+
+
+@pytest.mark.anyio
+async def test_export_users_csv(async_client: AsyncClient, register_user, admin_headers):
+    await register_user("export@example.com", departmentId="9")
+
+    response = await async_client.get(
+        "/users/export", params={"format": "csv", "departmentId": 9}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("userId,firstName")
+    assert "export@example.com" in lines[1]
+
+
+@pytest.mark.anyio
+async def test_my_profile_etag(async_client: AsyncClient, register_user):
+    token = await register_user("etag@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.get("/users/me", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"u')
+
+    response = await async_client.get("/users/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.anyio
+async def test_list_users_conditional_get(async_client: AsyncClient, register_user, admin_headers):
+    await register_user("pending@example.com", departmentId="8")
+    params = {"departmentId": 8}
+
+    response = await async_client.get("/users", params=params, headers=admin_headers)
+    etag = response.headers["etag"]
+    assert "last-modified" not in response.headers
+    user_id = response.json()[0]["userId"]
+
+    response = await async_client.get("/users", params=params, headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    await async_client.put(f"/users/{user_id}/approve", json={"status": True}, headers=admin_headers)
+
+    response = await async_client.get("/users", params=params, headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.anyio
+async def test_list_users_etag_changes_when_row_leaves_filter(async_client: AsyncClient, register_user, admin_headers):
+    for i in range(2):
+        await register_user(f"leaving{i}@example.com", departmentId="9")
+    params = {"departmentId": 9, "registrationStatus": False}
+
+    response = await async_client.get("/users", params=params, headers=admin_headers)
+    etag = response.headers["etag"]
+    user_id = response.json()[0]["userId"]
+
+    # Approving moves the row out of the filter; the newest remaining row is unchanged
+    await async_client.put(f"/users/{user_id}/approve", json={"status": True}, headers=admin_headers)
+
+    response = await async_client.get(
+        "/users", params=params,
+        headers={**admin_headers, "If-None-Match": etag, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+    assert response.status_code == 200
+    assert user_id not in [user["userId"] for user in response.json()]
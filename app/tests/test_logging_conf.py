@@ -0,0 +1,41 @@
+# tests/test_logging_conf.py
+import logging
+import queue
+
+import pytest
+
+from app.config import config
+from app.logging_conf import QUEUED_LOGGERS, DroppingQueueHandler, configure_logging, stop_logging
+
+
+@pytest.mark.anyio
+async def test_queue_handler_drops_when_full():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.queue.get_nowait().getMessage() == "hello world"
+    assert handler.dropped == 1
+
+
+@pytest.mark.anyio
+async def test_queued_logging_filters_every_logger(monkeypatch, tmp_path, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "LOG_QUEUE_ENABLED", True)
+    monkeypatch.setattr(config, "LOG_RICH_CONSOLE", False)
+    try:
+        configure_logging()
+        # Written straight to the shared console handler without the queue, this failed
+        # to format for lack of correlation_id and skipped email obfuscation
+        logging.getLogger("databases").warning("pool exhausted", extra={"email": "someone@example.com"})
+        stop_logging()
+    finally:
+        for name in QUEUED_LOGGERS:
+            logging.getLogger(name).handlers = []
+
+    err = capsys.readouterr().err
+    assert "pool exhausted" in err
+    assert "Formatting field not found" not in err
@@ -0,0 +1,51 @@
+# tests/test_server.py
+import os
+import sys
+import types
+
+import pytest
+
+from app import server
+from app.config import config
+from app.server import per_worker_pool_size, pool_environment, resolve_workers, uvicorn_options
+
+
+@pytest.mark.anyio
+async def test_connection_budget_is_split_across_workers():
+    assert per_worker_pool_size(20, 4, default=3) == 5
+    assert per_worker_pool_size(10, 3, default=3) == 3
+    assert per_worker_pool_size(2, 4, default=3) == 1
+    assert per_worker_pool_size(None, 4, default=3) == 3
+
+
+@pytest.mark.anyio
+async def test_pool_environment_uses_the_active_prefix():
+    env = pool_environment(5)
+    assert env["TEST_DB_POOL_MAX_SIZE"] == "5"
+    assert int(env["TEST_DB_POOL_MIN_SIZE"]) <= 5
+
+
+@pytest.mark.anyio
+async def test_uvicorn_options():
+    assert resolve_workers(None) >= 1
+    options = uvicorn_options("127.0.0.1", 9000, workers=2)
+    assert options["workers"] == 2
+    assert options["loop"] in ("uvloop", "asyncio")
+    assert options["http"] in ("httptools", "h11")
+    assert options["timeout_graceful_shutdown"] > 0
+
+
+@pytest.mark.anyio
+async def test_single_worker_serve_applies_the_connection_budget(monkeypatch):
+    # With one worker uvicorn runs the app in this process, so the live config must change
+    monkeypatch.setattr(config, "DB_POOL_MAX_SIZE", 10)
+    monkeypatch.setattr(config, "DB_POOL_MIN_SIZE", 5)
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    runs = []
+    monkeypatch.setitem(sys.modules, "uvicorn", types.SimpleNamespace(run=lambda app, **options: runs.append(options)))
+
+    assert server.main(["serve", "--workers", "1", "--db-max-connections", "3"]) == 0
+
+    assert runs[0]["workers"] == 1
+    assert (config.DB_POOL_MAX_SIZE, config.DB_POOL_MIN_SIZE) == (3, 3)
+    assert os.environ["TEST_DB_POOL_MAX_SIZE"] == "3"
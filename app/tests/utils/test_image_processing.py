@@ -0,0 +1,33 @@
+# tests/utils/test_image_processing.py
+import pytest
+
+from app.utils.image_processing import ImageProcessor
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.mark.anyio
+async def test_large_proof_is_downscaled_and_thumbnailed(tmp_path):
+    Image.effect_noise((1600, 800), 64).convert("RGB").save(tmp_path / "7_proof.png")
+    processor = ImageProcessor(max_dimension=800, thumbnail_size=100)
+
+    processed = await processor.process(str(tmp_path / "7_proof.png"), str(tmp_path), "7_proof")
+    processor.shutdown()
+
+    assert processed.filename == "7_proof.webp"
+    assert processed.thumbnail == "7_proof_thumb.webp"
+    with Image.open(tmp_path / processed.filename) as image:
+        assert image.size == (800, 400)
+    with Image.open(tmp_path / processed.thumbnail) as image:
+        assert max(image.size) == 100
+    assert not list(tmp_path.glob("*.part"))
+
+
+@pytest.mark.anyio
+async def test_non_images_are_left_alone(tmp_path):
+    (tmp_path / "7_proof.pdf").write_bytes(b"%PDF-1.4 not really")
+    processor = ImageProcessor()
+
+    assert await processor.process(str(tmp_path / "7_proof.pdf"), str(tmp_path), "7_proof") is None
+    processor.shutdown()
+    assert [path.name for path in tmp_path.iterdir()] == ["7_proof.pdf"]
@@ -0,0 +1,85 @@
+# tests/utils/test_job_queue.py
+import pytest
+
+from app.db import backgroundJobs
+from app.db.database import database
+from app.utils.job_queue import FAILED, PENDING, JobQueue
+
+
+async def _job(job_id: int):
+    return await database.fetch_one(backgroundJobs.select().where(backgroundJobs.c.jobId == job_id))
+
+
+@pytest.mark.anyio
+async def test_successful_job_leaves_the_outbox():
+    queue = JobQueue()
+    seen = []
+
+    @queue.handler("record")
+    async def record(payload):
+        seen.append(payload)
+
+    job_id = await queue.enqueue("record", {"value": 1})
+    assert await queue.run_pending() == 1
+    assert seen == [{"value": 1}]
+    assert await _job(job_id) is None
+    assert queue.stats()["processed"] == 1
+
+
+@pytest.mark.anyio
+async def test_failures_back_off_then_fail_permanently():
+    queue = JobQueue(max_attempts=2, retry_base_seconds=0)
+
+    @queue.handler("broken")
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    job_id = await queue.enqueue("broken", {})
+    await queue.run_pending()
+    job = await _job(job_id)
+    assert (job["status"], job["attempts"]) == (PENDING, 1)
+    assert "boom" in job["lastError"]
+
+    await queue.run_pending()
+    job = await _job(job_id)
+    assert (job["status"], job["attempts"]) == (FAILED, 2)
+    assert queue.stats()["retried"] == 1 and queue.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_delayed_jobs_are_not_due_yet():
+    queue = JobQueue()
+
+    @queue.handler("later")
+    async def later(payload):
+        pass
+
+    await queue.enqueue("later", {}, delay_seconds=60)
+    assert await queue.run_pending() == 0
+    assert queue.stats()["depth"] == 1
+
+
+@pytest.mark.anyio
+async def test_backoff_is_exponential_and_capped():
+    queue = JobQueue(retry_base_seconds=2, retry_max_seconds=10)
+    assert [queue.backoff(n) for n in (1, 2, 3, 4)] == [2, 4, 8, 10]
+
+
+@pytest.mark.anyio
+async def test_job_that_kills_its_worker_is_not_retried_forever():
+    queue = JobQueue(max_attempts=2, lease_seconds=-1)
+
+    @queue.handler("crash")
+    async def crash(payload):
+        pass
+
+    job_id = await queue.enqueue("crash", {})
+    # The worker dies after claiming: nothing records the outcome, the lease just expires
+    for attempt in (1, 2):
+        assert len(await queue._claim(10)) == 1
+        assert (await _job(job_id))["attempts"] == attempt
+
+    assert await queue._claim(10) == []
+    job = await _job(job_id)
+    assert (job["status"], job["attempts"]) == (FAILED, 2)
+    assert queue.stats()["failed"] == 1
@@ -0,0 +1,33 @@
+# tests/utils/test_password_hasher.py
+import pytest
+from fastapi import HTTPException
+
+from app.utils.password_hasher import PasswordHasher
+
+
+@pytest.mark.anyio
+async def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(max_workers=2, max_queue=4)
+    hashed = await hasher.hash("s3cret")
+
+    assert await hasher.verify("s3cret", hashed) is True
+    assert await hasher.verify("wrong", hashed) is False
+
+    stats = hasher.stats()
+    assert stats["hash_count"] == 1
+    assert stats["verify_count"] == 2
+    assert stats["in_flight"] == 0
+    hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    hasher.in_flight = 1
+
+    with pytest.raises(HTTPException) as exc:
+        await hasher.hash("s3cret")
+
+    assert exc.value.status_code == 503
+    assert hasher.stats()["rejected_count"] == 1
+    hasher.shutdown()
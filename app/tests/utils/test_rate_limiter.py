@@ -0,0 +1,35 @@
+# tests/utils/test_rate_limiter.py
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.rate_limiter import InMemorySlidingWindow, LoginThrottle
+
+
+@pytest.mark.anyio
+async def test_sliding_window_limits_and_recovers(monkeypatch):
+    window = InMemorySlidingWindow()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    assert await window.hit("k", limit=2, window_seconds=10) == 0
+    assert await window.hit("k", limit=2, window_seconds=10) == 0
+    assert await window.hit("k", limit=2, window_seconds=10) == pytest.approx(10)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10.5)
+    assert await window.hit("k", limit=2, window_seconds=10) == 0
+
+
+@pytest.mark.anyio
+async def test_login_throttle_rejects_by_ip():
+    throttle = LoginThrottle(InMemorySlidingWindow(), per_email=100, per_ip=2, window_seconds=60)
+    await throttle.check("a@example.com", "10.0.0.1")
+    await throttle.check("b@example.com", "10.0.0.1")
+
+    with pytest.raises(HTTPException) as exc:
+        await throttle.check("c@example.com", "10.0.0.1")
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) > 0
+
+    await throttle.check("c@example.com", "10.0.0.2")
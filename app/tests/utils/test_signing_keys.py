@@ -0,0 +1,52 @@
+# tests/utils/test_signing_keys.py
+import json
+
+import ecdsa
+import pytest
+from jose import JWTError, jwt
+
+from app.utils.signing_keys import load_key_ring
+
+
+def _ec_pem() -> str:
+    return ecdsa.SigningKey.generate(curve=ecdsa.NIST256p).to_pem().decode()
+
+
+@pytest.mark.anyio
+async def test_rotation_keeps_old_tokens_valid(tmp_path):
+    old_private = _ec_pem()
+    old_ring = load_key_ring(None, old_private, "ES256", active_kid="2024-01")
+    old_token = old_ring.sign({"sub": "a@example.com"})
+
+    (tmp_path / "new.pem").write_text(_ec_pem())
+    keys_file = tmp_path / "keys.json"
+    keys_file.write_text(json.dumps({
+        "active_kid": "2024-06",
+        "keys": [
+            {"kid": "2024-06", "alg": "ES256", "private_key_file": "new.pem"},
+            {"kid": "2024-01", "alg": "ES256", "public_key": old_ring.active.verifier.to_pem().decode()},
+        ],
+    }))
+    ring = load_key_ring(str(keys_file), None, "HS256")
+
+    new_token = ring.sign({"sub": "b@example.com"})
+    assert jwt.get_unverified_header(new_token)["kid"] == "2024-06"
+    assert ring.verify(new_token)["sub"] == "b@example.com"
+    assert ring.verify(old_token)["sub"] == "a@example.com"
+    assert {key["kid"] for key in ring.public_jwks()["keys"]} == {"2024-06", "2024-01"}
+
+
+@pytest.mark.anyio
+async def test_unknown_kid_and_wrong_secret_are_rejected():
+    ring = load_key_ring(None, "secret-one", "HS256", active_kid="one")
+    other = load_key_ring(None, "secret-two", "HS256", active_kid="two")
+
+    with pytest.raises(JWTError):
+        ring.verify(other.sign({"sub": "a@example.com"}))
+    assert ring.public_jwks() == {"keys": []}
+
+
+@pytest.mark.anyio
+async def test_unsupported_algorithm_fails_at_load():
+    with pytest.raises(ValueError, match="Unsupported JWT algorithm"):
+        load_key_ring(None, "secret", "EdDSA")
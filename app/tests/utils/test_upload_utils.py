@@ -0,0 +1,72 @@
+# tests/utils/test_upload_utils.py
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from httpx import ASGITransport, AsyncClient
+
+from app.utils.upload_utils import UploadSizeLimitMiddleware
+
+BOUNDARY = "limit-test"
+
+
+def multipart(size: int) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="proof.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode() + b"\x00" * size + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture()
+def limited_client():
+    app = FastAPI()
+    app.state.reads = 0
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=1024)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        app.state.reads += 1
+        return {"size": len(await file.read())}
+
+    return app, AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_upload_limit_allows_small_bodies(limited_client):
+    app, client = limited_client
+    async with client:
+        response = await client.post(
+            "/upload", content=multipart(100),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+        )
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+@pytest.mark.anyio
+async def test_upload_limit_rejects_declared_length_before_reading(limited_client):
+    app, client = limited_client
+    async with client:
+        response = await client.post(
+            "/upload", content=multipart(4096),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+        )
+    assert response.status_code == 413
+    assert app.state.reads == 0
+
+
+@pytest.mark.anyio
+async def test_upload_limit_cuts_off_chunked_bodies(limited_client):
+    app, client = limited_client
+    body = multipart(4096)
+
+    async def chunks():
+        for start in range(0, len(body), 256):
+            yield body[start:start + 256]
+
+    async with client:
+        response = await client.post(
+            "/upload", content=chunks(),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+        )
+    assert response.status_code == 413
+    assert app.state.reads == 0
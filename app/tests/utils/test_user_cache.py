@@ -0,0 +1,53 @@
+# tests/utils/test_user_cache.py
+import time
+
+import pytest
+
+from app.utils.user_cache import UserCache
+
+
+def _user(user_id: int, email: str) -> dict:
+    return {"userId": user_id, "email": email, "roleId": 2}
+
+
+@pytest.mark.anyio
+async def test_hit_and_miss_counters():
+    cache = UserCache(ttl_seconds=60, max_size=10)
+    assert cache.get("a@example.com") is None
+
+    cache.set("a@example.com", _user(1, "a@example.com"))
+    assert cache.get("a@example.com")["userId"] == 1
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+@pytest.mark.anyio
+async def test_evicts_least_recently_used():
+    cache = UserCache(ttl_seconds=60, max_size=2)
+    cache.set("a@example.com", _user(1, "a@example.com"))
+    cache.set("b@example.com", _user(2, "b@example.com"))
+    cache.get("a@example.com")
+    cache.set("c@example.com", _user(3, "c@example.com"))
+
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") is not None
+    assert cache.get("c@example.com") is not None
+
+
+@pytest.mark.anyio
+async def test_entries_expire(monkeypatch):
+    cache = UserCache(ttl_seconds=5, max_size=10)
+    cache.set("a@example.com", _user(1, "a@example.com"))
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a@example.com") is None
+
+
+@pytest.mark.anyio
+async def test_invalidate_by_user_id():
+    cache = UserCache(ttl_seconds=60, max_size=10)
+    cache.set("a@example.com", _user(1, "a@example.com"))
+
+    cache.invalidate(user_id=1)
+    assert cache.get("a@example.com") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,58 @@
+# utils/conditional
+#
+# Weak ETags for user resources, derived from userId + updatedAt so a 304 can be answered
+# without serializing the body. Stored files get strong ETags from their stat result.
+#
+# There is deliberately no Last-Modified: for a list page the newest updatedAt does not move
+# when a row leaves the filter or is deleted, so If-Modified-Since would answer a stale 304.
+# A list ETag covers the ids and versions of every row on the page and changes in both cases.
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+
+def row_version(row) -> Optional[datetime]:
+    return row["updatedAt"] or row["createdAt"]
+
+
+def user_etag(row) -> str:
+    version = row_version(row)
+    stamp = version.strftime("%Y%m%d%H%M%S%f") if version else "0"
+    return f'W/"u{row["userId"]}-{stamp}"'
+
+
+def list_etag(rows: Iterable, *parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode())
+    for row in rows:
+        digest.update(user_etag(row).encode())
+    return f'W/"l{digest.hexdigest()[:20]}"'
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    # Files are replaced, never edited in place, so mtime + size identify the content
+    return f'"f{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are equivalent
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return if_none_match is not None and _etag_matches(if_none_match, etag)
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,143 @@
+# utils/image_processing
+#
+# Re-encodes payment proof images with a size/quality cap and renders a thumbnail.
+# Pillow is optional: without it proofs are kept as uploaded and no thumbnail is made.
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from app.config import config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+
+class ProcessedImage(NamedTuple):
+    filename: str
+    thumbnail: str
+
+
+def _save(image, path: str, output_format: str, quality: int) -> str:
+    # Written under a temporary name; the caller renames it so readers never see a partial file
+    temp_path = f"{path}.part"
+    image.save(temp_path, format=output_format, quality=quality, optimize=True)
+    return temp_path
+
+
+def _process(
+    source_path: str,
+    dest_dir: str,
+    stem: str,
+    output_format: str,
+    max_dimension: int,
+    quality: int,
+    thumbnail_size: int,
+) -> Optional[ProcessedImage]:
+    """Blocking part, run in the worker pool; None if the file is not an image Pillow reads."""
+    try:
+        image = Image.open(source_path)
+        image.load()
+    except (OSError, Image.DecompressionBombError):
+        return None
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if output_format == "JPEG" and image.mode == "RGBA":
+        image = image.convert("RGB")
+
+    extension = EXTENSIONS.get(output_format, output_format.lower())
+    source_size = os.path.getsize(source_path)
+    resized = max(image.size) > max_dimension
+
+    full = image.copy()
+    full.thumbnail((max_dimension, max_dimension))
+    filename = f"{stem}.{extension}"
+    temp_path = _save(full, os.path.join(dest_dir, filename), output_format, quality)
+    if not resized and os.path.getsize(temp_path) >= source_size:
+        # The upload is already smaller than anything we produce; keep it as is
+        os.remove(temp_path)
+        filename = os.path.basename(source_path)
+    else:
+        os.replace(temp_path, os.path.join(dest_dir, filename))
+
+    thumb = image.copy()
+    thumb.thumbnail((thumbnail_size, thumbnail_size))
+    thumbnail = f"{stem}_thumb.{extension}"
+    thumbnail_path = os.path.join(dest_dir, thumbnail)
+    os.replace(_save(thumb, thumbnail_path, output_format, quality), thumbnail_path)
+    return ProcessedImage(filename, thumbnail)
+
+
+class ImageProcessor:
+    """Runs Pillow work in a worker pool so re-encoding never blocks the event loop."""
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 2,
+        output_format: str = "WEBP",
+        max_dimension: int = 2000,
+        quality: int = 80,
+        thumbnail_size: int = 320,
+    ):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.output_format = output_format.upper()
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.thumbnail_size = thumbnail_size
+        self._executor: Optional[Executor] = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image-processor")
+        return self._executor
+
+    async def process(self, source_path: str, dest_dir: str, stem: str) -> Optional[ProcessedImage]:
+        if not self.available:
+            logger.warning("Pillow is not installed; keeping payment proof as uploaded")
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            _process,
+            source_path,
+            dest_dir,
+            stem,
+            self.output_format,
+            self.max_dimension,
+            self.quality,
+            self.thumbnail_size,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+image_processor = ImageProcessor(
+    executor_type=config.IMAGE_PROCESSING_EXECUTOR,
+    max_workers=config.IMAGE_PROCESSING_MAX_WORKERS,
+    output_format=config.IMAGE_OUTPUT_FORMAT,
+    max_dimension=config.IMAGE_MAX_DIMENSION,
+    quality=config.IMAGE_QUALITY,
+    thumbnail_size=config.IMAGE_THUMBNAIL_SIZE,
+)
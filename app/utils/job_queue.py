@@ -0,0 +1,302 @@
+# utils/job_queue
+#
+# In-process async job queue backed by the backgroundJobs table (a durable outbox).
+# enqueue() inserts a row inside the caller's transaction, so a job exists exactly when
+# the work that produced it was committed and survives restarts. Workers claim due rows
+# under a lease, run the registered handler and delete the row on success; failures are
+# retried with exponential backoff and kept with status "failed" after the last attempt.
+# Attempts are counted when a job is claimed, so a job that keeps killing its worker is
+# also given up on once its lease expires after the last attempt.
+
+import asyncio
+import datetime
+import json
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import sqlalchemy as sa
+
+from app.config import config
+from app.db import backgroundJobs
+from app.db.database import database
+from app.utils.metrics import Counter, Histogram, registry
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+FAILED = "failed"
+
+jobs_total = registry.register(Counter(
+    "background_jobs_total", "Background job runs by kind and outcome", ("kind", "outcome")
+))
+job_duration = registry.register(Histogram(
+    "background_job_duration_seconds", "Background job run time by kind", ("kind",)
+))
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+
+class JobQueue:
+    def __init__(
+        self,
+        concurrency: int = 4,
+        poll_seconds: float = 5.0,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+        self.running = 0
+        self.depth = 0
+        self.metrics = {"processed": 0, "retried": 0, "failed": 0}
+
+    def handler(self, kind: str):
+        """Register the coroutine that runs jobs of `kind`; it receives the JSON payload."""
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            return func
+        return decorator
+
+    async def enqueue(self, kind: str, payload: dict, delay_seconds: float = 0.0) -> int:
+        """Write a job to the outbox; call inside the transaction that makes it necessary."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        now = datetime.datetime.utcnow()
+        job_id = await database.execute(
+            backgroundJobs.insert().values(
+                kind=kind,
+                payload=json.dumps(payload),
+                status=PENDING,
+                attempts=0,
+                runAfter=now + datetime.timedelta(seconds=delay_seconds),
+                createdAt=now,
+            )
+        )
+        self.depth += 1
+        return job_id
+
+    def wake(self) -> None:
+        """Nudge the dispatcher once the enqueuing transaction has committed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+
+    def _due(self, now: datetime.datetime):
+        c = backgroundJobs.c
+        return sa.or_(
+            sa.and_(c.status == PENDING, c.runAfter <= now),
+            # Lease expired: the worker that held the job died mid-run
+            sa.and_(c.status == RUNNING, c.lockedUntil < now, c.attempts < self.max_attempts),
+        )
+
+    async def _fail_abandoned(self, now: datetime.datetime) -> None:
+        """Give up on jobs whose last allowed attempt never reported back."""
+        c = backgroundJobs.c
+        rows = await database.fetch_all(
+            sa.select(c.jobId, c.kind, c.attempts).where(
+                c.status == RUNNING, c.lockedUntil < now, c.attempts >= self.max_attempts
+            )
+        )
+        for row in rows:
+            await database.execute(
+                backgroundJobs.update()
+                .where(c.jobId == row["jobId"], c.status == RUNNING, c.lockedUntil < now)
+                .values(status=FAILED, claimToken=None, lockedUntil=None, lastError="Lease expired while running")
+            )
+            self.metrics["failed"] += 1
+            jobs_total.inc(kind=row["kind"], outcome="failed")
+            logger.error(
+                "Background job failed permanently: its worker stopped mid-run",
+                extra={"jobId": row["jobId"], "kind": row["kind"], "attempts": row["attempts"]},
+            )
+
+    async def _claim(self, limit: int) -> list:
+        """Lock up to `limit` due jobs for this process; safe with several processes polling."""
+        c = backgroundJobs.c
+        now = datetime.datetime.utcnow()
+        await self._fail_abandoned(now)
+        rows = await database.fetch_all(
+            sa.select(c.jobId).where(self._due(now)).order_by(c.jobId).limit(limit)
+        )
+        if not rows:
+            return []
+
+        token = uuid.uuid4().hex
+        # Re-checking the due condition makes the update a no-op for rows another process claimed first
+        await database.execute(
+            backgroundJobs.update()
+            .where(c.jobId.in_([row["jobId"] for row in rows]), self._due(now))
+            .values(
+                status=RUNNING,
+                attempts=c.attempts + 1,
+                claimToken=token,
+                lockedUntil=now + datetime.timedelta(seconds=self.lease_seconds),
+            )
+        )
+        return await database.fetch_all(backgroundJobs.select().where(c.claimToken == token))
+
+    async def _run(self, job) -> None:
+        c = backgroundJobs.c
+        kind = job["kind"]
+        start = time.perf_counter()
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {kind!r}")
+            await handler(json.loads(job["payload"]))
+        except Exception as exc:
+            outcome = await self._record_failure(job, exc)
+        else:
+            await database.execute(
+                backgroundJobs.delete().where(c.jobId == job["jobId"], c.claimToken == job["claimToken"])
+            )
+            self.metrics["processed"] += 1
+            outcome = "done"
+        job_duration.observe(time.perf_counter() - start, kind=kind)
+        jobs_total.inc(kind=kind, outcome=outcome)
+
+    async def _record_failure(self, job, exc: Exception) -> str:
+        c = backgroundJobs.c
+        attempts = job["attempts"]  # already counted when the job was claimed
+        values = {"lastError": repr(exc), "claimToken": None, "lockedUntil": None}
+        if attempts >= self.max_attempts:
+            values["status"] = FAILED
+            self.metrics["failed"] += 1
+            outcome = "failed"
+            logger.error(
+                "Background job failed permanently",
+                exc_info=exc,
+                extra={"jobId": job["jobId"], "kind": job["kind"], "attempts": attempts},
+            )
+        else:
+            delay = self.backoff(attempts)
+            values["status"] = PENDING
+            values["runAfter"] = datetime.datetime.utcnow() + datetime.timedelta(seconds=delay)
+            self.metrics["retried"] += 1
+            outcome = "retried"
+            logger.warning(
+                "Background job failed, retrying",
+                exc_info=exc,
+                extra={"jobId": job["jobId"], "kind": job["kind"], "attempts": attempts, "retryIn": delay},
+            )
+        await database.execute(
+            backgroundJobs.update()
+            .where(c.jobId == job["jobId"], c.claimToken == job["claimToken"])
+            .values(**values)
+        )
+        return outcome
+
+    async def _release(self, jobs: list) -> None:
+        """Return claimed but unstarted jobs to the outbox, without counting the attempt."""
+        c = backgroundJobs.c
+        for job in jobs:
+            await database.execute(
+                backgroundJobs.update()
+                .where(c.jobId == job["jobId"], c.claimToken == job["claimToken"])
+                .values(status=PENDING, attempts=c.attempts - 1, claimToken=None, lockedUntil=None)
+            )
+
+    async def _count_pending(self) -> int:
+        c = backgroundJobs.c
+        return await database.fetch_val(sa.select(sa.func.count()).select_from(backgroundJobs).where(c.status == PENDING))
+
+    async def run_pending(self, limit: int = 100) -> int:
+        """Run due jobs inline, one pass; used by tests and maintenance scripts."""
+        jobs = await self._claim(limit)
+        for job in jobs:
+            await self._run(job)
+        self.depth = await self._count_pending()
+        return len(jobs)
+
+    async def _dispatch(self) -> None:
+        while True:
+            try:
+                free = self.concurrency - self.running - self._queue.qsize()
+                if free > 0:
+                    for job in await self._claim(free):
+                        self._queue.put_nowait(job)
+                self.depth = await self._count_pending()
+            except Exception:
+                logger.exception("Failed to poll background jobs")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            try:
+                await self._run(job)
+            except Exception:
+                logger.exception("Background job bookkeeping failed", extra={"jobId": job["jobId"]})
+            finally:
+                self.running -= 1
+                self._queue.task_done()
+                # Capacity freed up; look for more due jobs without waiting for the next poll
+                self._wakeup.set()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._dispatch())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        logger.info("Background job workers started", extra={"concurrency": self.concurrency})
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop polling, hand back unstarted jobs and give running ones `timeout` seconds to finish."""
+        if not self._tasks:
+            return
+        dispatcher, *workers = self._tasks
+        dispatcher.cancel()
+
+        unstarted = []
+        while not self._queue.empty():
+            unstarted.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if unstarted:
+            await self._release(unstarted)
+
+        deadline = time.monotonic() + timeout
+        while self.running and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        # Jobs still running keep their lease and are picked up again once it expires
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._wakeup = None
+
+    def stats(self) -> dict:
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return {**self.metrics, "depth": self.depth, "queued": queued, "running": self.running}
+
+
+job_queue = JobQueue(
+    concurrency=config.JOB_QUEUE_CONCURRENCY,
+    poll_seconds=config.JOB_QUEUE_POLL_SECONDS,
+    max_attempts=config.JOB_MAX_ATTEMPTS,
+    retry_base_seconds=config.JOB_RETRY_BASE_SECONDS,
+    retry_max_seconds=config.JOB_RETRY_MAX_SECONDS,
+    lease_seconds=config.JOB_LEASE_SECONDS,
+)
@@ -0,0 +1,168 @@
+# utils/metrics
+#
+# Minimal in-process metrics rendered in the Prometheus text format. Observations are a
+# dict lookup plus a bisect, so they are cheap enough for every request and query.
+
+import bisect
+import threading
+import time
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(label_names: tuple, label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_label_text(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _label_text(self.label_names, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            labels = _label_text(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.label_names, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_label_text(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class GaugeSet:
+    """Metrics read from a callback at scrape time, e.g. pool or cache stats.
+
+    Keys listed in `counters` only ever grow (hits, jobs processed, ...) and are exported
+    as counters named <prefix>_<key>_total, with a trailing "_count" dropped from the key;
+    everything else is a gauge.
+    """
+
+    def __init__(self, prefix: str, documentation: str, collect: Callable[[], dict], counters: Iterable[str] = ()):
+        self.prefix = prefix
+        self.documentation = documentation
+        self.collect = collect
+        self.counters = frozenset(counters)
+
+    def render(self) -> list[str]:
+        lines = []
+        for key, value in self.collect().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in self.counters:
+                name, kind = f"{self.prefix}_{key.removesuffix('_count')}_total", "counter"
+            else:
+                name, kind = f"{self.prefix}_{key}", "gauge"
+            lines += [f"# HELP {name} {self.documentation}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP responses by route and status", ("method", "route", "status")
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Database query latency by query name", ("query",)
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify latency", ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Use the template (/users/{user_id}) so the label set stays bounded
+            route_name = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route_name)
+            http_requests_total.inc(method=method, route=route_name, status=status_code)
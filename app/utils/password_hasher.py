@@ -0,0 +1,111 @@
+# utils/password_hasher
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import config
+from app.utils.metrics import password_hash_duration
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"])
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing/verification in a bounded worker pool so the event loop never blocks."""
+
+    def __init__(self, executor_type: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.metrics = {
+            "hash_count": 0,
+            "verify_count": 0,
+            "rejected_count": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        }
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+            logger.info(
+                "Password hasher pool started",
+                extra={"executor": self.executor_type, "max_workers": self.max_workers},
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def _run(self, metric: str, func, *args):
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.metrics["rejected_count"] += 1
+            logger.warning("Password hasher queue is full", extra={"in_flight": self.in_flight})
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self.in_flight += 1
+        try:
+            async with self._get_semaphore():
+                loop = asyncio.get_running_loop()
+                start = time.perf_counter()
+                result = await loop.run_in_executor(self._get_executor(), func, *args)
+                elapsed = time.perf_counter() - start
+        finally:
+            self.in_flight -= 1
+
+        password_hash_duration.observe(elapsed, operation=func.__name__.lstrip("_"))
+        self.metrics[metric] += 1
+        self.metrics["total_seconds"] += elapsed
+        self.metrics["max_seconds"] = max(self.metrics["max_seconds"], elapsed)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash_count", _hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify_count", _verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {**self.metrics, "in_flight": self.in_flight}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=config.PASSWORD_HASH_EXECUTOR,
+    max_workers=config.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=config.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,93 @@
+# utils/rate_limiter
+
+import importlib
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Protocol
+
+from fastapi import HTTPException, status
+
+from app.config import config
+from app.utils.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+login_throttled_total = registry.register(Counter(
+    "login_throttled_total", "Login attempts rejected by the rate limiter", ("scope",)
+))
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        """Record an attempt; return 0 if allowed, else seconds until the next attempt is allowed."""
+
+
+class InMemorySlidingWindow:
+    """Per-process sliding-window log. Use a shared backend when running several workers."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, deque]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        now = time.monotonic()
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            attempts = self._attempts[key] = deque()
+            if len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+        else:
+            self._attempts.move_to_end(key)
+
+        while attempts and attempts[0] <= now - window_seconds:
+            attempts.popleft()
+        if len(attempts) >= limit:
+            return attempts[0] + window_seconds - now
+        attempts.append(now)
+        return 0.0
+
+
+def load_backend(path: Optional[str]) -> RateLimitBackend:
+    """Build the backend named by "package.module:factory", or the in-memory one."""
+    if not path:
+        return InMemorySlidingWindow()
+    module_name, _, attribute = path.partition(":")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+
+class LoginThrottle:
+    def __init__(self, backend: RateLimitBackend, per_email: int, per_ip: int, window_seconds: float):
+        self.backend = backend
+        self.per_email = per_email
+        self.per_ip = per_ip
+        self.window_seconds = window_seconds
+
+    async def check(self, email: str, client_ip: Optional[str]) -> None:
+        """Raise 429 before any DB lookup or bcrypt work if this email or IP is over its limit."""
+        limits = [("email", f"login:email:{email.strip().lower()}", self.per_email)]
+        if client_ip:
+            limits.append(("ip", f"login:ip:{client_ip}", self.per_ip))
+
+        for scope, key, limit in limits:
+            if limit <= 0:
+                continue
+            retry_after = await self.backend.hit(key, limit, self.window_seconds)
+            if retry_after > 0:
+                login_throttled_total.inc(scope=scope)
+                logger.warning(f"Login throttled by {scope}", extra={"email": email})
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please retry later",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+
+login_throttle = LoginThrottle(
+    load_backend(config.LOGIN_RATE_LIMIT_BACKEND),
+    per_email=config.LOGIN_RATE_LIMIT_PER_EMAIL,
+    per_ip=config.LOGIN_RATE_LIMIT_PER_IP,
+    window_seconds=config.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
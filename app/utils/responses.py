@@ -0,0 +1,38 @@
+# utils/responses
+#
+# Serialization helpers that go straight from rows/models to JSON bytes, skipping
+# jsonable_encoder and the intermediate dicts of JSONResponse.
+
+from typing import Optional
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+from app.schema.user_schema import UserOut
+
+JSON_MEDIA_TYPE = "application/json"
+
+user_list_adapter = TypeAdapter(list[UserOut])
+
+
+def validate_users(rows) -> list[UserOut]:
+    """Validate DB rows as UserOut in a single pass."""
+    # dict(row) goes through Record.__getitem__, which applies the column result processors
+    return user_list_adapter.validate_python([dict(row) for row in rows])
+
+
+def user_list_response(rows, headers: Optional[dict] = None) -> Response:
+    return Response(
+        content=user_list_adapter.dump_json(validate_users(rows)),
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK, headers: Optional[dict] = None) -> Response:
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
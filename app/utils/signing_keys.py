@@ -0,0 +1,126 @@
+# utils/signing_keys
+#
+# JWT signing material, parsed once on first use. Tokens carry the signing key's `kid`
+# header so keys can rotate without downtime: new tokens are signed with the active key,
+# and tokens signed with an older key stay valid while that key is still listed.
+#
+# JWT_KEYS_FILE (JSON):
+#   {"active_kid": "2024-06",
+#    "keys": [{"kid": "2024-06", "alg": "ES256", "private_key_file": "keys/2024-06.pem"},
+#             {"kid": "2024-01", "alg": "ES256", "public_key_file": "keys/2024-01.pub.pem"},
+#             {"kid": "legacy", "alg": "HS256", "secret": "..."}]}
+# Without a keys file, SECRET_KEY/ALGORITHM (env-prefixed, e.g. DEV_SECRET_KEY) form a
+# single key.
+
+import json
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from jose.constants import ALGORITHMS
+
+from app.config import config
+
+HMAC_ALGORITHMS = ALGORITHMS.HMAC
+ASYMMETRIC_ALGORITHMS = ALGORITHMS.RSA_DS | ALGORITHMS.EC_DS
+SUPPORTED_ALGORITHMS = HMAC_ALGORITHMS | ASYMMETRIC_ALGORITHMS
+DEFAULT_KID = "default"
+
+
+class SigningKey(NamedTuple):
+    kid: str
+    algorithm: str
+    signer: Optional[Key]  # None for verify-only (retired) keys
+    verifier: Key
+
+
+class KeyRing:
+    def __init__(self, keys: list[SigningKey], active_kid: str):
+        self._keys = {key.kid: key for key in keys}
+        if active_kid not in self._keys or self._keys[active_kid].signer is None:
+            raise ValueError(f"Active JWT key {active_kid!r} is missing or has no private key")
+        self.active = self._keys[active_kid]
+
+    def sign(self, claims: dict) -> str:
+        key = self.active
+        return jwt.encode(claims, key.signer, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def verify(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        # Tokens issued before kids were added are checked against the active key
+        key = self._keys.get(kid) if kid is not None else self.active
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        return jwt.decode(token, key.verifier, algorithms=[key.algorithm])
+
+    def public_jwks(self) -> dict:
+        """Public halves of the asymmetric keys, for services that verify tokens themselves."""
+        keys = []
+        for key in self._keys.values():
+            if key.algorithm in ASYMMETRIC_ALGORITHMS:
+                keys.append({**key.verifier.to_dict(), "kid": key.kid, "use": "sig"})
+        return {"keys": keys}
+
+
+def _read(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def _pem(entry: dict, field: str, base_dir: str) -> Optional[str]:
+    # Inline PEM, or a "<field>_file" path relative to the keys file
+    path = entry.get(f"{field}_file")
+    return _read(os.path.join(base_dir, path)) if path else entry.get(field)
+
+
+def build_key(kid: str, algorithm: str, secret: Optional[str] = None,
+              private_key: Optional[str] = None, public_key: Optional[str] = None) -> SigningKey:
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported JWT algorithm {algorithm!r} for key {kid!r}")
+
+    if algorithm in HMAC_ALGORITHMS:
+        if not secret:
+            raise ValueError(f"JWT key {kid!r} ({algorithm}) needs a secret")
+        key = jwk.construct(secret, algorithm)
+        return SigningKey(kid, algorithm, key, key)
+
+    if private_key:
+        signer = jwk.construct(private_key, algorithm)
+        return SigningKey(kid, algorithm, signer, signer.public_key())
+    if public_key:
+        return SigningKey(kid, algorithm, None, jwk.construct(public_key, algorithm))
+    raise ValueError(f"JWT key {kid!r} ({algorithm}) needs a private or public key")
+
+
+def load_key_ring(keys_file: Optional[str], secret_key: Optional[str], algorithm: str,
+                  active_kid: Optional[str] = None) -> KeyRing:
+    if keys_file:
+        base_dir = os.path.dirname(os.path.abspath(keys_file))
+        spec = json.loads(_read(keys_file))
+        keys = []
+        for entry in spec["keys"]:
+            keys.append(build_key(
+                entry["kid"],
+                entry["alg"],
+                secret=entry.get("secret"),
+                private_key=_pem(entry, "private_key", base_dir),
+                public_key=_pem(entry, "public_key", base_dir),
+            ))
+        return KeyRing(keys, active_kid or spec["active_kid"])
+
+    if not secret_key:
+        raise RuntimeError("No JWT signing key configured: set SECRET_KEY (env-prefixed) or JWT_KEYS_FILE")
+    kid = active_kid or DEFAULT_KID
+    if algorithm in HMAC_ALGORITHMS:
+        key = build_key(kid, algorithm, secret=secret_key)
+    else:
+        key = build_key(kid, algorithm, private_key=secret_key)
+    return KeyRing([key], kid)
+
+
+@lru_cache()
+def get_key_ring() -> KeyRing:
+    """Parsed once per process; call get_key_ring.cache_clear() after changing key settings."""
+    return load_key_ring(config.JWT_KEYS_FILE, config.SECRET_KEY, config.ALGORITHM, config.JWT_ACTIVE_KID)
@@ -0,0 +1,115 @@
+# utils/token_revocation
+
+import asyncio
+import datetime
+import logging
+from typing import Iterable, Optional
+
+from app.db import revokedTokens
+from app.db.database import database
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_timestamp(value: datetime.datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class RevocationList:
+    """In-memory view of the revokedTokens table, refreshed periodically from the DB."""
+
+    def __init__(self):
+        self._jtis: set[str] = set()
+        self._users_revoked_at: dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Held across refresh's read-and-swap and each revocation's write-and-add, so a
+        # revocation made while a refresh is in flight is never replaced by an older snapshot
+        self._lock = asyncio.Lock()
+        self.last_refreshed: Optional[float] = None
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[int], issued_at: Optional[float]) -> bool:
+        if jti is not None and jti in self._jtis:
+            return True
+        if user_id is not None and user_id in self._users_revoked_at:
+            # Tokens issued before the user-wide revocation are no longer valid
+            return issued_at is None or issued_at <= self._users_revoked_at[user_id]
+        return False
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._refresh()
+
+    async def _refresh(self) -> None:
+        now = datetime.datetime.utcnow()
+        query = revokedTokens.select().where(revokedTokens.c.expiresAt > now)
+        rows = await database.fetch_all(query)
+
+        jtis: set[str] = set()
+        users_revoked_at: dict[int, float] = {}
+        for row in rows:
+            if row["jti"]:
+                jtis.add(row["jti"])
+            elif row["userId"] is not None:
+                revoked_at = _utc_timestamp(row["revokedAt"])
+                users_revoked_at[row["userId"]] = max(revoked_at, users_revoked_at.get(row["userId"], 0.0))
+
+        self._jtis = jtis
+        self._users_revoked_at = users_revoked_at
+        self.last_refreshed = _utc_timestamp(now)
+        logger.debug("Revocation list refreshed", extra={"jtis": len(jtis), "users": len(users_revoked_at)})
+
+    async def revoke_token(self, jti: str, user_id: Optional[int], expires_at: datetime.datetime) -> None:
+        async with self._lock:
+            await database.execute(
+                revokedTokens.insert().values(
+                    jti=jti,
+                    userId=user_id,
+                    revokedAt=datetime.datetime.utcnow(),
+                    expiresAt=expires_at,
+                )
+            )
+            self._jtis.add(jti)
+        logger.info("Token revoked", extra={"userId": user_id})
+
+    async def revoke_users(self, user_ids: Iterable[int], expires_at: datetime.datetime) -> None:
+        """Revoke every token issued to these users so far, e.g. when their token claims go stale."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return
+        revoked_at = datetime.datetime.utcnow()
+        async with self._lock:
+            await database.execute(
+                revokedTokens.insert().values([
+                    {"jti": None, "userId": user_id, "revokedAt": revoked_at, "expiresAt": expires_at}
+                    for user_id in user_ids
+                ])
+            )
+            for user_id in user_ids:
+                self._users_revoked_at[user_id] = _utc_timestamp(revoked_at)
+        logger.info("All tokens revoked for users", extra={"users": len(user_ids)})
+
+    async def _refresh_forever(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh revocation list")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,168 @@
+# utils/upload_utils
+
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# Magic-byte signatures of the file types accepted as payment evidence
+CONTENT_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+)
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    for signature, content_type in CONTENT_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def safe_filename(filename: str) -> str:
+    # Drop any client-supplied directory components
+    name = os.path.basename(filename.replace("\\", "/")).strip()
+    return name or "upload"
+
+
+def resolve_upload_path(upload_dir: str, filename: str) -> Optional[str]:
+    """Absolute path of filename inside upload_dir, or None if it would escape the directory."""
+    root = os.path.realpath(upload_dir)
+    path = os.path.realpath(os.path.join(root, filename))
+    if path == root or os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+
+class UploadSizeLimitMiddleware:
+    """ASGI middleware that refuses oversized multipart bodies before they are spooled.
+
+    Starlette parses the whole form (spilling files to disk) before a route runs, so the
+    per-file check in stream_upload_to_temp alone would only fire after the upload was read.
+    A declared Content-Length over the limit is answered with 413 without reading the body;
+    chunked bodies are counted as they arrive and cut off once they pass the limit.
+    """
+
+    def __init__(self, app, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes if max_bytes is not None else (
+            config.UPLOAD_MAX_BYTES + config.UPLOAD_FORM_OVERHEAD_BYTES
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds {self.max_bytes} bytes"
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > self.max_bytes:
+            response = JSONResponse({"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the form parser; FastAPI passes HTTPException through unchanged
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+            return message
+
+        await self.app(scope, receive_limited, send)
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                return value.lower().startswith(b"multipart/")
+        return False
+
+    @staticmethod
+    def _content_length(scope) -> Optional[int]:
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+
+async def stream_upload_to_temp(
+    upload: UploadFile,
+    dest_dir: str,
+    max_bytes: int = config.UPLOAD_MAX_BYTES,
+    chunk_size: int = config.UPLOAD_CHUNK_SIZE,
+) -> tuple[str, str]:
+    """Copy an upload into a temp file in dest_dir chunk by chunk; returns (temp_path, content_type)."""
+    # Created on first upload rather than at import time
+    await run_in_threadpool(os.makedirs, dest_dir, exist_ok=True)
+    temp = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, dir=dest_dir, prefix=".upload-", suffix=".part", delete=False
+    )
+    size = 0
+    content_type = None
+    try:
+        while chunk := await upload.read(chunk_size):
+            if content_type is None:
+                content_type = sniff_content_type(chunk)
+                if content_type is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                        detail="Payment evidence must be a PNG, JPEG, GIF, WEBP or PDF file",
+                    )
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Payment evidence exceeds {max_bytes} bytes",
+                )
+            await run_in_threadpool(temp.write, chunk)
+
+        if content_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Payment evidence file is empty",
+            )
+        await run_in_threadpool(temp.close)
+    except BaseException:
+        await run_in_threadpool(temp.close)
+        await discard_upload(temp.name)
+        raise
+
+    logger.debug("Upload streamed to temp file", extra={"size": size, "contentType": content_type})
+    return temp.name, content_type
+
+
+async def finalize_upload(temp_path: str, dest_dir: str, filename: str) -> str:
+    """Atomically move a streamed temp file to its final name in dest_dir."""
+    final_path = os.path.join(dest_dir, filename)
+    await run_in_threadpool(os.replace, temp_path, final_path)
+    return final_path
+
+
+async def discard_upload(temp_path: Optional[str]) -> None:
+    if temp_path is None:
+        return
+    try:
+        await run_in_threadpool(os.remove, temp_path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,79 @@
+# utils/user_cache
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """Bounded TTL + LRU cache of resolved user rows, keyed by email."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._emails_by_id: dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> Optional[Any]:
+        if self.max_size <= 0:
+            self.misses += 1
+            return None
+
+        entry = self._entries.get(email)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._remove(email)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(email)
+        self.hits += 1
+        return user
+
+    def set(self, email: str, user: Any) -> None:
+        if self.max_size <= 0 or user is None:
+            return
+
+        self._entries[email] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(email)
+        self._emails_by_id[user["userId"]] = email
+
+        while len(self._entries) > self.max_size:
+            oldest, _ = next(iter(self._entries.items()))
+            self._remove(oldest)
+
+    def invalidate(self, email: Optional[str] = None, user_id: Optional[int] = None) -> None:
+        if email is None and user_id is not None:
+            email = self._emails_by_id.get(user_id)
+        if email is not None:
+            self._remove(email)
+            logger.debug("User cache entry invalidated", extra={"email": email})
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._emails_by_id.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, email: str) -> None:
+        entry = self._entries.pop(email, None)
+        if entry is not None:
+            self._emails_by_id.pop(entry[1]["userId"], None)
+
+
+user_cache = UserCache(
+    ttl_seconds=config.USER_CACHE_TTL_SECONDS,
+    max_size=config.USER_CACHE_MAX_SIZE,
+)
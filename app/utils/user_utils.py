@@ -1,22 +1,65 @@
 import logging
+from typing import Optional
+
+import sqlalchemy as sa
+
 from app.db import users
-from app.db.database import database
+from app.db.database import read_router
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by listings; the password hash is never selected
+USER_LIST_COLUMNS = [
+    users.c.userId,
+    users.c.firstName,
+    users.c.lastName,
+    users.c.email,
+    users.c.phoneNumber,
+    users.c.departmentId,
+    users.c.roleId,
+    users.c.subscriptionTypeId,
+    users.c.registrationStatus,
+    users.c.isActive,
+    users.c.createdAt,
+    users.c.updatedAt,
+]
+
+USER_FILTER_COLUMNS = ("registrationStatus", "isActive", "departmentId", "roleId", "subscriptionTypeId")
+
+# Read-your-writes key for admin listings; marked after approvals
+USER_LIST_KEY = "users:list"
+
 async def fetch_user_by_email(email: str):
     logger.debug(f"Fetching user by email: {email}")
     query = users.select().where((users.c.email == email) & (users.c.isActive == True))
-    user = await database.fetch_one(query)
+    user = await read_router.fetch_one(query, key=email)
     return user
 
-async def fetch_all_users():
-    query = users.select()
-    return await database.fetch_all(query)
+def user_filter_clauses(filters: Optional[dict] = None) -> list:
+    return [
+        users.c[name] == value
+        for name, value in (filters or {}).items()
+        if name in USER_FILTER_COLUMNS and value is not None
+    ]
+
+
+def build_user_list_query(filters: Optional[dict] = None, after_id: Optional[int] = None):
+    query = sa.select(*USER_LIST_COLUMNS).where(*user_filter_clauses(filters))
+    if after_id is not None:
+        query = query.where(users.c.userId > after_id)
+    return query.order_by(users.c.userId)
+
+
+async def fetch_all_users(after_id: Optional[int] = None, limit: Optional[int] = None, filters: Optional[dict] = None):
+    """Keyset-paginated listing ordered by userId; pass the last userId of a page as after_id."""
+    query = build_user_list_query(filters, after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return await read_router.fetch_all(query, key=USER_LIST_KEY)
 
 async def fetch_user_by_id(user_id: int):
     query = users.select().where(users.c.userId == user_id)
-    return await database.fetch_one(query)
+    return await read_router.fetch_one(query, key=user_id)
 
 
 # async def update_user_registration_status(user_id: int):
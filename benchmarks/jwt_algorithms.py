@@ -0,0 +1,56 @@
+# benchmarks/jwt_algorithms
+#
+# Per-algorithm cost of signing and verifying access tokens with keys parsed once (the
+# KeyRing path) against parsing the key material on every call.
+
+import argparse
+import os
+import sys
+import time
+
+# Only key handling is exercised; no database or environment-specific settings are used
+os.environ.setdefault("ENV_STATE", "test")
+
+import ecdsa
+import rsa
+from jose import jwt
+
+from app.utils.signing_keys import load_key_ring
+
+CLAIMS = {"sub": "bench@example.com", "role_id": 2, "exp": 4102444800, "jti": "0" * 32}
+
+
+def key_material() -> dict[str, str]:
+    _, rsa_private = rsa.newkeys(2048)
+    return {
+        "HS256": "benchmark-secret",
+        "RS256": rsa_private.save_pkcs1().decode(),
+        "ES256": ecdsa.SigningKey.generate(curve=ecdsa.NIST256p).to_pem().decode(),
+    }
+
+
+def per_op_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.jwt_algorithms", description="Time JWT sign/verify")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'alg':>6} {'sign us':>10} {'verify us':>10} {'sign us (parse each call)':>26}")
+    for algorithm, material in key_material().items():
+        ring = load_key_ring(None, material, algorithm)
+        token = ring.sign(CLAIMS)
+        sign = per_op_us(lambda: ring.sign(CLAIMS), args.iterations)
+        verify = per_op_us(lambda: ring.verify(token), args.iterations)
+        unparsed = per_op_us(lambda: jwt.encode(CLAIMS, material, algorithm=algorithm), args.iterations)
+        print(f"{algorithm:>6} {sign:>10.1f} {verify:>10.1f} {unparsed:>26.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# benchmarks/load_test
+#
+# Seeds N users/payments and drives the hot endpoints through the ASGI app at a fixed
+# concurrency, reporting p50/p95/p99 latency and throughput per scenario.
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import math
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable
+
+os.environ.setdefault("DEV_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DEV_ALGORITHM", "HS256")
+
+import httpx
+from sqlalchemy import select
+
+from app.db import migrate
+from app.db.Users import userPayments, users
+from app.db.database import database
+from app.main import app
+from app.utils.password_hasher import password_hasher
+from app.utils.rate_limiter import login_throttle
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SCENARIOS = ("login", "me", "list", "register")
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "bench-admin@example.com"
+SEED_BATCH_SIZE = 1000
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+async def seed(user_count: int) -> None:
+    """Insert bench users (and their payment rows) that are not there yet."""
+    emails = [ADMIN_EMAIL] + [bench_email(i) for i in range(user_count)]
+    present = {
+        row["email"] for row in await database.fetch_all(select(users.c.email).where(users.c.email.in_(emails)))
+    }
+    missing = [email for email in emails if email not in present]
+    if not missing:
+        return
+
+    # One hash shared by every seeded user keeps seeding fast
+    hashed_password = await password_hasher.hash(PASSWORD)
+    now = datetime.datetime.utcnow()
+
+    for start in range(0, len(missing), SEED_BATCH_SIZE):
+        batch = missing[start:start + SEED_BATCH_SIZE]
+        await database.execute_many(users.insert(), [
+            {
+                "firstName": "Bench",
+                "lastName": "User",
+                "email": email,
+                "password": hashed_password,
+                "phoneNumber": "0000000000",
+                "departmentId": 1,
+                "roleId": 1 if email == ADMIN_EMAIL else 2,
+                "subscriptionTypeId": 1,
+                "registrationStatus": True,
+                "isActive": True,
+                "createdAt": now,
+            }
+            for email in batch
+        ])
+        rows = await database.fetch_all(select(users.c.userId).where(users.c.email.in_(batch)))
+        await database.execute_many(userPayments.insert(), [
+            {"userId": row["userId"], "paymentEvidence": None, "transactionId": "BENCH", "isActive": True, "createdAt": now}
+            for row in rows
+        ])
+    print(f"Seeded {len(missing)} users")
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/api/user/login", json={"user_email": email, "user_password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+async def run_scenario(send: Callable[[int], Awaitable[httpx.Response]], total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run(args) -> dict:
+    # Measure the endpoints themselves, not the login throttle
+    login_throttle.per_email = login_throttle.per_ip = 0
+    migrate.upgrade()
+    await database.connect()
+    try:
+        await seed(args.users)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            admin_headers = {"Authorization": f"Bearer {await login(client, ADMIN_EMAIL)}"}
+            user_tokens = [await login(client, bench_email(i)) for i in range(min(args.users, 50))]
+            run_id = uuid.uuid4().hex[:8]
+            # Warm-up and measured runs reuse indexes, so registrations number themselves
+            registration_ids = itertools.count()
+
+            senders = {
+                "login": lambda i: client.post(
+                    "/api/user/login",
+                    json={"user_email": bench_email(i % args.users), "user_password": PASSWORD},
+                ),
+                "me": lambda i: client.get(
+                    "/users/me", headers={"Authorization": f"Bearer {user_tokens[i % len(user_tokens)]}"}
+                ),
+                "list": lambda i: client.get("/users", params={"limit": 100}, headers=admin_headers),
+                "register": lambda i: client.post("/api/register/", data={
+                    "firstName": "Bench",
+                    "lastName": "Register",
+                    "email": f"bench-reg-{run_id}-{next(registration_ids)}@example.com",
+                    "password": PASSWORD,
+                    "phoneNumber": "0000000000",
+                    "departmentId": "1",
+                    "roleId": "2",
+                    "subscriptionTypeId": "1",
+                }),
+            }
+
+            results = {}
+            for name in args.scenario:
+                send = senders[name]
+                await run_scenario(send, args.warmup, args.concurrency)
+                results[name] = await run_scenario(send, args.requests, args.concurrency)
+                print(f"{name:>9}: {results[name]}")
+            return results
+    finally:
+        await database.disconnect()
+        password_hasher.shutdown()
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions where p95 latency grew or throughput dropped by more than `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {result['throughput_rps']} rps vs baseline {base['throughput_rps']} rps"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test", description="Load-test the hot endpoints")
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression, e.g. 0.25 = 25%%")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print("Performance regressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# benchmarks/serialization
+#
+# Times encoding a page of user rows the old way (UserOut per row + jsonable_encoder +
+# JSONResponse) against the TypeAdapter/dump_json path used by the list endpoints.
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV_STATE", "test")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.schema.user_schema import UserOut
+from app.utils.responses import user_list_response
+
+
+def make_rows(count: int) -> list[dict]:
+    now = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    return [
+        {
+            "userId": index,
+            "firstName": "Bench",
+            "lastName": "User",
+            "email": f"bench{index}@example.com",
+            "phoneNumber": "0000000000",
+            "departmentId": 1,
+            "roleId": 2,
+            "subscriptionTypeId": 1,
+            "registrationStatus": True,
+            "isActive": True,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for index in range(count)
+    ]
+
+
+def old_path(rows: list[dict]) -> bytes:
+    return JSONResponse(content=jsonable_encoder([UserOut(**row) for row in rows])).body
+
+
+def new_path(rows: list[dict]) -> bytes:
+    return user_list_response(rows).body
+
+
+def best_of(func, rows: list[dict], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization", description="Time user list encoding")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    old = best_of(old_path, rows, args.repeat)
+    new = best_of(new_path, rows, args.repeat)
+    print(f"jsonable_encoder + JSONResponse: {old * 1000:8.1f} ms")
+    print(f"TypeAdapter + dump_json:         {new * 1000:8.1f} ms")
+    print(f"speed-up: {old / new:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
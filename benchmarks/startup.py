@@ -0,0 +1,99 @@
+# benchmarks/startup
+#
+# Measures cold-start cost in fresh interpreters: time to import app.main, time for the
+# lifespan startup (DB connect, warm-up), and time until the first request is answered.
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import_ms", "startup_ms", "first_request_ms", "total_ms")
+
+
+async def _serve_first_request(app) -> float:
+    import httpx
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def _start_and_request(app) -> tuple[float, float]:
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter() - start
+        first_request = await _serve_first_request(app)
+    return started, first_request
+
+
+def child() -> None:
+    """One cold start; prints the phase timings as JSON."""
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter() - start
+
+    started, first_request = asyncio.run(_start_and_request(app))
+    print(json.dumps({
+        "import_ms": imported * 1000,
+        "startup_ms": started * 1000,
+        "first_request_ms": first_request * 1000,
+        "total_ms": (time.perf_counter() - start) * 1000,
+    }))
+
+
+def _run(command: list[str]) -> str:
+    """Run one cold start in a fresh interpreter; returns its stdout."""
+    # app.config refuses to guess the environment, so the children default to dev
+    env = {**os.environ}
+    env.setdefault("ENV_STATE", "dev")
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Cold start failed (exit {result.returncode}):\n{result.stderr}")
+    return result.stdout
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Time cold starts")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-only", action="store_true", help="Skip the lifespan/first request (no DB needed)")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if the median import time exceeds this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child()
+        return 0
+
+    samples = []
+    for _ in range(args.runs):
+        if args.import_only:
+            code = "import time; s = time.perf_counter(); import app.main; print((time.perf_counter() - s) * 1000)"
+            output = _run([sys.executable, "-c", code])
+            samples.append({"import_ms": float(output.strip().splitlines()[-1])})
+        else:
+            command = [sys.executable, "-m", "benchmarks.startup", "--child"]
+            output = _run(command)
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = {
+        phase: round(statistics.median(sample[phase] for sample in samples), 1)
+        for phase in PHASES if phase in samples[0]
+    }
+    for phase, value in results.items():
+        print(f"{phase:>17}: {value} ms")
+
+    if args.max_import_ms is not None and results["import_ms"] > args.max_import_ms:
+        print(f"Import took {results['import_ms']} ms, above the {args.max_import_ms} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())